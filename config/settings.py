@@ -6,6 +6,7 @@ Environment variables override defaults.
 """
 
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -18,6 +19,12 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+@lru_cache(maxsize=8)
+def _split_assets(assets: str) -> tuple[str, ...]:
+    """Split a comma-separated asset list (cached per distinct string)."""
+    return tuple(asset.strip() for asset in assets.split(","))
+
+
 class TradingMode(str, Enum):
     """Trading mode enumeration."""
     PAPER = "paper"
@@ -164,7 +171,7 @@ class Settings(BaseSettings):
     def get_trading_assets(self) -> list[str]:
         """Get list of trading assets."""
         if isinstance(self.trading_assets, str):
-            return [asset.strip() for asset in self.trading_assets.split(",")]
+            return list(_split_assets(self.trading_assets))
         return self.trading_assets
 
     def get_active_trading_assets(self) -> list[str]:
@@ -176,7 +183,7 @@ class Settings(BaseSettings):
             - If empty: all trading_assets
         """
         if self.active_trading_assets and self.active_trading_assets.strip():
-            return [asset.strip() for asset in self.active_trading_assets.split(",")]
+            return list(_split_assets(self.active_trading_assets))
         # Default to all trading assets if not specified
         return self.get_trading_assets()
 
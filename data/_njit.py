@@ -0,0 +1,18 @@
+"""
+Numba `njit` with a no-op fallback.
+
+Numba is optional: when it isn't installed, `njit`-decorated kernels run
+as plain Python/NumPy functions with the same results, just slower.
+"""
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """Stand-in for `numba.njit` supporting both `@njit` and `@njit(...)`."""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+__all__ = ["njit"]
@@ -8,12 +8,14 @@ This module provides the MarketDataFetcher class for:
 - Returning data as pandas DataFrames
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 
 import ccxt
 import pandas as pd
 import logging
+from requests.adapters import HTTPAdapter
 
 from config.settings import settings
 
@@ -24,6 +26,11 @@ logger = logging.getLogger(__name__)
 class MarketDataFetcher:
     """Fetch market data from Hyperliquid exchange via ccxt."""
 
+    # Per-request timeout (ms) so one slow symbol can't stall a whole cycle
+    REQUEST_TIMEOUT_MS = 10_000
+    # Upper bound on concurrent requests in fetch_ohlcv_many
+    MAX_FETCH_WORKERS = 8
+
     def __init__(self):
         """
         Initialize exchange connection.
@@ -35,6 +42,7 @@ class MarketDataFetcher:
             # No authentication needed for public market data
             exchange_config = {
                 "enableRateLimit": True,
+                "timeout": self.REQUEST_TIMEOUT_MS,
                 "options": {
                     "defaultType": "swap",  # Hyperliquid perpetuals (swaps)
                     # Skip HIP-3 spot markets since we're only trading perps
@@ -48,9 +56,20 @@ class MarketDataFetcher:
 
             self.exchange = ccxt.hyperliquid(exchange_config)
 
+            # ccxt reuses one requests session; size its keep-alive pool so
+            # each fetch_ohlcv_many worker keeps a warm connection (and TLS
+            # session) across cycles instead of discarding the overflow
+            self.exchange.session.mount(
+                "https://", HTTPAdapter(pool_connections=1, pool_maxsize=self.MAX_FETCH_WORKERS)
+            )
+
             if settings.hyperliquid_testnet:
                 self.exchange.set_sandbox_mode(True)
 
+            # Raw candles from the last fetch per (symbol, timeframe), so the
+            # next cycle only requests bars from the last (forming) one on
+            self._candles: Dict[Tuple[str, str], List[list]] = {}
+
             logger.info(f"Initialized Hyperliquid exchange connection (testnet={settings.hyperliquid_testnet})")
 
         except Exception as e:
@@ -125,7 +144,7 @@ class MarketDataFetcher:
         """
         try:
             ccxt_symbol = self._to_ccxt_symbol(symbol)
-            ohlcv = self.exchange.fetch_ohlcv(ccxt_symbol, timeframe, limit=limit)
+            ohlcv = self._fetch_candles(ccxt_symbol, timeframe, limit)
 
             if not ohlcv:
                 logger.warning(f"No OHLCV data returned for {symbol} {timeframe}")
@@ -149,6 +168,9 @@ class MarketDataFetcher:
 
             return df
 
+        except ccxt.RequestTimeout as e:
+            logger.warning(f"Timed out fetching {symbol} {timeframe}: {e}")
+            return pd.DataFrame()
         except ccxt.ExchangeNotAvailable as e:
             logger.warning(f"Exchange not available for {symbol} {timeframe}: {e}")
             return pd.DataFrame()
@@ -159,6 +181,64 @@ class MarketDataFetcher:
             logger.error(f"Error fetching OHLCV for {symbol} {timeframe}: {e}")
             return pd.DataFrame()
 
+    def _fetch_candles(self, ccxt_symbol: str, timeframe: str, limit: int) -> List[list]:
+        """
+        Fetch the latest `limit` raw candles, reusing the previous fetch.
+
+        Only bars from the last cached (possibly still forming) one onwards
+        are requested; they replace the cached tail. The cached window keeps
+        its length, so a short fetch (e.g. the 1-bar price check) doesn't
+        shrink it for the next cycle. Falls back to a full fetch when there
+        is no usable cache or the gap is too long to cover in one request.
+        """
+        key = (ccxt_symbol, timeframe)
+        cached = self._candles.get(key)
+
+        if cached and len(cached) >= limit:
+            since = cached[-1][0]
+            bar_ms = self.exchange.parse_timeframe(timeframe) * 1000
+            if self.exchange.milliseconds() - since < (len(cached) - 1) * bar_ms:
+                fresh = self.exchange.fetch_ohlcv(ccxt_symbol, timeframe, since=since, limit=len(cached))
+                if fresh and fresh[0][0] <= since:
+                    first_ts = fresh[0][0]
+                    merged = [bar for bar in cached if bar[0] < first_ts] + fresh
+                    self._candles[key] = merged[-len(cached):]
+                    return merged[-limit:]
+
+        ohlcv = self.exchange.fetch_ohlcv(ccxt_symbol, timeframe, limit=limit)
+        if ohlcv and (not cached or len(ohlcv) >= len(cached)):
+            self._candles[key] = ohlcv
+        return ohlcv
+
+    def fetch_ohlcv_many(
+        self,
+        symbols: List[str],
+        timeframe: str = "3m",
+        limit: int = 100
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch OHLCV data for several symbols concurrently.
+
+        The requests are network-bound, so running them on a thread pool
+        makes the total latency roughly that of the slowest symbol instead
+        of the sum. All threads share this fetcher's exchange session.
+
+        Args:
+            symbols: Trading pairs to fetch
+            timeframe: Candlestick interval
+            limit: Number of candles per symbol
+
+        Returns:
+            Dictionary mapping symbol to DataFrame (in `symbols` order; empty
+            DataFrame for symbols that failed, as with `fetch_ohlcv`)
+        """
+        if len(symbols) <= 1:
+            return {symbol: self.fetch_ohlcv(symbol, timeframe, limit) for symbol in symbols}
+
+        with ThreadPoolExecutor(max_workers=min(self.MAX_FETCH_WORKERS, len(symbols))) as pool:
+            frames = pool.map(lambda symbol: self.fetch_ohlcv(symbol, timeframe, limit), symbols)
+            return dict(zip(symbols, frames))
+
     def fetch_funding_rate(self, symbol: str) -> Optional[float]:
         """
         Fetch current funding rate for a perpetual.
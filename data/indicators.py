@@ -1,21 +1,125 @@
 """
 Calculate technical indicators for market data.
 
-This module provides technical indicator calculations using pandas_ta.
+This module provides technical indicator calculations on float64 NumPy
+arrays, reproducing the pandas_ta formulas: recursive smoothings (EMA, RSI,
+MACD, ATR) run as Numba-compiled kernels, the rest is vectorized NumPy.
 Supports both intraday (3-minute) and longer-term (4-hour) timeframes
 matching the Alpha Arena methodology.
 """
 
 from typing import Optional, Dict, List
 
+import numpy as np
 import pandas as pd
-import pandas_ta as ta
 import logging
 
+from data._njit import njit
+
 
 logger = logging.getLogger(__name__)
 
 
+@njit(cache=True)
+def _ewm(values: np.ndarray, alpha: float) -> np.ndarray:
+    """pandas ``ewm(alpha=alpha, adjust=False).mean()``: NaN inputs carry the last value forward."""
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    weighted = np.nan
+    old_wt = 1.0
+    for i in range(n):
+        cur = values[i]
+        observed = cur == cur
+        if weighted == weighted:
+            # Missing bars still decay the old weight (ignore_na=False)
+            old_wt *= 1.0 - alpha
+            if observed:
+                if weighted != cur:
+                    weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+                old_wt = 1.0
+        elif observed:
+            weighted = cur
+        out[i] = weighted
+    return out
+
+
+@njit(cache=True)
+def _seeded_ewm(values: np.ndarray, length: int, alpha: float) -> np.ndarray:
+    """Exponential smoothing seeded with the SMA of the first ``length`` values (pandas_ta presma)."""
+    n = values.shape[0]
+    if n < length:
+        return np.full(n, np.nan)
+    seeded = values.copy()
+    seeded[:length - 1] = np.nan
+    seeded[length - 1] = np.nanmean(values[:length])
+    return _ewm(seeded, alpha)
+
+
+@njit(cache=True)
+def _ema(values: np.ndarray, length: int) -> np.ndarray:
+    """EMA (span ``length``) seeded with an SMA."""
+    return _seeded_ewm(values, length, 2.0 / (length + 1))
+
+
+@njit(cache=True)
+def _rsi(close: np.ndarray, length: int) -> np.ndarray:
+    """RSI using Wilder's moving average (RMA) of gains and losses."""
+    n = close.shape[0]
+    gains = np.full(n, np.nan)
+    losses = np.full(n, np.nan)
+    for i in range(1, n):
+        diff = close[i] - close[i - 1]
+        if diff == diff:
+            gains[i] = diff if diff > 0.0 else 0.0
+            losses[i] = -diff if diff < 0.0 else 0.0
+    alpha = 1.0 / length
+    up = _ewm(gains, alpha)
+    down = _ewm(losses, alpha)
+    out = np.full(n, np.nan)
+    for i in range(n):
+        total = up[i] + down[i]
+        if total != 0.0:
+            out[i] = 100.0 * up[i] / total
+    return out
+
+
+@njit(cache=True)
+def _macd(close: np.ndarray, fast: int, slow: int, signal: int):
+    """MACD line, signal line and histogram (signal EMA starts at the first valid MACD)."""
+    macd = _ema(close, fast) - _ema(close, slow)
+    signal_line = np.full(close.shape[0], np.nan)
+    start = slow - 1
+    if close.shape[0] > start:
+        signal_line[start:] = _ema(macd[start:], signal)
+    return macd, signal_line, macd - signal_line
+
+
+def _atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, length: int) -> np.ndarray:
+    """ATR: true range smoothed with Wilder's RMA, seeded with an SMA."""
+    prev_close = np.empty_like(close)
+    prev_close[0] = np.nan
+    prev_close[1:] = close[:-1]
+    # fmax skips the missing previous close on the first bar (TR = high - low)
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(prev_close - low)))
+    return _seeded_ewm(true_range, length, 1.0 / length)
+
+
+def _sma(values: np.ndarray, length: int) -> np.ndarray:
+    """Simple moving average via a cumulative sum; a NaN only blanks the windows containing it."""
+    out = np.full(values.shape[0], np.nan)
+    if values.shape[0] < length:
+        return out
+    missing = np.isnan(values)
+    csum = np.cumsum(np.where(missing, 0.0, values))
+    cmissing = np.cumsum(missing)
+    out[length - 1] = csum[length - 1]
+    out[length:] = csum[length:] - csum[:-length]
+    gaps = cmissing[length - 1:].copy()
+    gaps[1:] -= cmissing[:-length]
+    out[length - 1:][gaps > 0] = np.nan
+    return out / length
+
+
 class TechnicalIndicators:
     """Calculate technical indicators for trading analysis."""
 
@@ -53,7 +157,8 @@ class TechnicalIndicators:
                 logger.debug(f"Not enough data for EMA{period} (need {period}, have {len(df)})")
                 return None
 
-            return ta.ema(df[column], length=period)
+            values = _ema(df[column].to_numpy(dtype=np.float64), period)
+            return pd.Series(values, index=df.index, name=f"EMA_{period}")
 
         except Exception as e:
             logger.error(f"Error calculating EMA{period}: {e}")
@@ -90,7 +195,8 @@ class TechnicalIndicators:
                 logger.debug(f"Not enough data for RSI{period} (need {period + 1}, have {len(df)})")
                 return None
 
-            return ta.rsi(df[column], length=period)
+            values = _rsi(df[column].to_numpy(dtype=np.float64), period)
+            return pd.Series(values, index=df.index, name=f"RSI_{period}")
 
         except Exception as e:
             logger.error(f"Error calculating RSI{period}: {e}")
@@ -131,7 +237,14 @@ class TechnicalIndicators:
                 logger.debug(f"Not enough data for MACD (need {slow + signal - 1}, have {len(df)})")
                 return None
 
-            return ta.macd(df[column], fast=fast, slow=slow, signal=signal)
+            macd, signal_line, hist = _macd(
+                df[column].to_numpy(dtype=np.float64), fast, slow, signal
+            )
+            props = f"_{fast}_{slow}_{signal}"
+            return pd.DataFrame(
+                {f"MACD{props}": macd, f"MACDh{props}": hist, f"MACDs{props}": signal_line},
+                index=df.index,
+            )
 
         except Exception as e:
             logger.error(f"Error calculating MACD: {e}")
@@ -164,7 +277,13 @@ class TechnicalIndicators:
                 logger.debug(f"Not enough data for ATR{period} (need {period + 1}, have {len(df)})")
                 return None
 
-            return ta.atr(df["high"], df["low"], df["close"], length=period)
+            values = _atr(
+                df["high"].to_numpy(dtype=np.float64),
+                df["low"].to_numpy(dtype=np.float64),
+                df["close"].to_numpy(dtype=np.float64),
+                period,
+            )
+            return pd.Series(values, index=df.index, name=f"ATRr_{period}")
 
         except Exception as e:
             logger.error(f"Error calculating ATR{period}: {e}")
@@ -198,7 +317,8 @@ class TechnicalIndicators:
                 logger.debug(f"Not enough data for SMA{period} (need {period}, have {len(df)})")
                 return None
 
-            return ta.sma(df[column], length=period)
+            values = _sma(df[column].to_numpy(dtype=np.float64), period)
+            return pd.Series(values, index=df.index, name=f"SMA_{period}")
 
         except Exception as e:
             logger.error(f"Error calculating SMA{period}: {e}")
@@ -222,76 +342,57 @@ class TechnicalIndicators:
         Returns:
             DataFrame with all indicators added
         """
-        result_df = df.copy()
-
         try:
             # Validate input
             required_cols = ["open", "high", "low", "close", "volume"]
-            if not all(col in result_df.columns for col in required_cols):
-                missing = [col for col in required_cols if col not in result_df.columns]
+            if not all(col in df.columns for col in required_cols):
+                missing = [col for col in required_cols if col not in df.columns]
                 logger.error(f"Missing required columns: {missing}")
-                return result_df
+                return df.copy()
 
-            if len(result_df) < 2:
+            if len(df) < 2:
                 logger.warning("DataFrame too small for indicator calculation")
-                return result_df
+                return df.copy()
 
-            # EMAs
-            logger.debug(f"Calculating EMAs (have {len(result_df)} candles)")
-            ema_20 = TechnicalIndicators.calculate_ema(result_df, period=20)
-            if ema_20 is not None:
-                result_df["ema_20"] = ema_20
+            # Every indicator runs on arrays converted once per column; the
+            # results are collected and attached in one concat at the end
+            # rather than inserted column by column
+            close = df["close"].to_numpy(dtype=np.float64)
+            n = len(close)
+            columns = {}
 
-            ema_50 = TechnicalIndicators.calculate_ema(result_df, period=50)
-            if ema_50 is not None:
-                result_df["ema_50"] = ema_50
+            logger.debug(f"Calculating EMAs (have {n} candles)")
+            for period in (TechnicalIndicators.EMA_SHORT, TechnicalIndicators.EMA_LONG):
+                if n >= period:
+                    columns[f"ema_{period}"] = _ema(close, period)
 
-            # RSIs
             logger.debug("Calculating RSIs")
-            rsi_7 = TechnicalIndicators.calculate_rsi(result_df, period=7)
-            if rsi_7 is not None:
-                result_df["rsi_7"] = rsi_7
-
-            rsi_14 = TechnicalIndicators.calculate_rsi(result_df, period=14)
-            if rsi_14 is not None:
-                result_df["rsi_14"] = rsi_14
+            for period in (TechnicalIndicators.RSI_SHORT, TechnicalIndicators.RSI_LONG):
+                if n >= period + 1:
+                    columns[f"rsi_{period}"] = _rsi(close, period)
 
-            # MACD
             logger.debug("Calculating MACD")
-            macd_df = TechnicalIndicators.calculate_macd(result_df)
-            if macd_df is not None and not macd_df.empty:
-                # pandas_ta returns columns like MACD_12_26_9, MACDs_12_26_9, MACDh_12_26_9
-                macd_cols = [col for col in macd_df.columns if "MACD" in col or "MACDs" in col or "MACDh" in col]
-                if macd_cols:
-                    for col in macd_df.columns:
-                        if "MACD_12_26_9" in col:
-                            result_df["macd"] = macd_df[col]
-                        elif "MACDs_12_26_9" in col:
-                            result_df["macd_signal"] = macd_df[col]
-                        elif "MACDh_12_26_9" in col:
-                            result_df["macd_hist"] = macd_df[col]
-
-            # ATRs
-            logger.debug("Calculating ATRs")
-            atr_3 = TechnicalIndicators.calculate_atr(result_df, period=3)
-            if atr_3 is not None:
-                result_df["atr_3"] = atr_3
+            if n >= 26 + 9 - 1:
+                columns["macd"], columns["macd_signal"], columns["macd_hist"] = _macd(close, 12, 26, 9)
 
-            atr_14 = TechnicalIndicators.calculate_atr(result_df, period=14)
-            if atr_14 is not None:
-                result_df["atr_14"] = atr_14
+            logger.debug("Calculating ATRs")
+            high = df["high"].to_numpy(dtype=np.float64)
+            low = df["low"].to_numpy(dtype=np.float64)
+            for period in (TechnicalIndicators.ATR_SHORT, TechnicalIndicators.ATR_LONG):
+                if n >= period + 1:
+                    columns[f"atr_{period}"] = _atr(high, low, close, period)
 
-            # Volume SMA
             logger.debug("Calculating volume SMA")
-            volume_sma = TechnicalIndicators.calculate_sma(result_df, period=20, column="volume")
-            if volume_sma is not None:
-                result_df["volume_sma_20"] = volume_sma
+            if n >= 20:
+                columns["volume_sma_20"] = _sma(df["volume"].to_numpy(dtype=np.float64), 20)
 
-            return result_df
+            # Existing indicator columns are replaced, as with assignment
+            base = df.drop(columns=[col for col in columns if col in df.columns])
+            return pd.concat([base, pd.DataFrame(columns, index=df.index)], axis=1)
 
         except Exception as e:
             logger.error(f"Error calculating all indicators: {e}")
-            return result_df
+            return df.copy()
 
 
 if __name__ == "__main__":
@@ -6,11 +6,12 @@ Claude as the reasoning engine. Includes retry logic, error handling, and
 comprehensive logging.
 """
 
-from typing import Optional, Dict, Any
+from typing import Callable, Optional, Dict, Any, List, Union
 import logging
 import time
 import sys
 
+import anthropic
 from anthropic import Anthropic, APIError, RateLimitError, APIConnectionError
 from tenacity import (
     retry,
@@ -26,6 +27,13 @@ from config.settings import settings
 logger = logging.getLogger(__name__)
 
 
+def _prompt_length(prompt: Union[str, List[Dict[str, Any]]]) -> int:
+    """Character length of a prompt given as a string or content blocks."""
+    if isinstance(prompt, str):
+        return len(prompt)
+    return sum(len(block["text"]) for block in prompt)
+
+
 class ClaudeClient:
     """Client for interacting with Anthropic Claude API."""
 
@@ -34,6 +42,11 @@ class ClaudeClient:
     DEFAULT_MAX_TOKENS = 2048
     DEFAULT_TEMPERATURE = 1.0
 
+    # Idle time (s) a pooled connection is kept. The SDK's default (5s) drops
+    # the connection between cycles, so every request paid a new TCP+TLS
+    # handshake; this covers the usual cycle intervals.
+    KEEPALIVE_EXPIRY_SECONDS = 600.0
+
     def __init__(
         self,
         api_key: Optional[str] = None,
@@ -54,11 +67,26 @@ class ClaudeClient:
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY not configured in settings")
 
-        self.client = Anthropic(api_key=self.api_key)
+        self.client = Anthropic(
+            api_key=self.api_key,
+            # The SDK's own client keeps its timeout, redirect and socket
+            # defaults; only the pool limits are replaced
+            http_client=anthropic.DefaultHttpxClient(
+                limits=type(anthropic.DEFAULT_CONNECTION_LIMITS)(
+                    max_connections=100,
+                    max_keepalive_connections=40,
+                    keepalive_expiry=self.KEEPALIVE_EXPIRY_SECONDS,
+                ),
+            ),
+        )
         self.model = model or self.DEFAULT_MODEL
         self.max_tokens = max_tokens
         self.temperature = temperature
 
+        # Token usage of the last successful request (incl. prompt-cache
+        # reads/writes), for callers that want to log it
+        self.last_usage: Optional[Dict[str, int]] = None
+
         logger.info(f"Initialized Claude client with model {self.model}")
 
     @retry(
@@ -69,8 +97,9 @@ class ClaudeClient:
     )
     def get_trading_decision(
         self,
-        system_prompt: str,
-        user_prompt: str,
+        system_prompt: Union[str, List[Dict[str, Any]]],
+        user_prompt: Union[str, List[Dict[str, Any]]],
+        should_abort: Optional[Callable[[], bool]] = None,
     ) -> Optional[str]:
         """
         Get trading decision from Claude.
@@ -79,25 +108,34 @@ class ClaudeClient:
         Logs all prompts and responses for debugging.
 
         Args:
-            system_prompt: System prompt with instructions
-            user_prompt: User prompt with market data
+            system_prompt: System prompt with instructions, either a plain
+                string or a list of content blocks (see
+                PromptBuilder.get_system_prompt_blocks)
+            user_prompt: User prompt with market data, either a plain string
+                or a list of content blocks (e.g. with cache_control
+                breakpoints from PromptBuilder.build_trading_prompt_blocks)
+            should_abort: Optional callable checked as the response streams
+                in; when it returns True the stream is closed and None is
+                returned (e.g. the bot was stopped mid-request)
 
         Returns:
-            Claude's response text or None if error
+            Claude's response text or None if error or aborted
         """
         try:
             start_time = time.time()
 
             logger.info(f"Sending request to Claude ({self.model})")
-            logger.debug(f"System prompt length: {len(system_prompt)} chars")
-            logger.debug(f"User prompt length: {len(user_prompt)} chars")
+            logger.debug(f"System prompt length: {_prompt_length(system_prompt)} chars")
+            logger.debug(f"User prompt length: {_prompt_length(user_prompt)} chars")
 
             # Console output for user visibility
             print(f"  -> Sending request to Claude API...", flush=True)
             print(f"  -> Waiting for response (this may take 10-30 seconds)...", flush=True)
 
-            # Make API call
-            response = self.client.messages.create(
+            # Make API call. The response is streamed so time-to-first-token
+            # is visible separately from the total generation time.
+            first_token_at = None
+            with self.client.messages.stream(
                 model=self.model,
                 max_tokens=self.max_tokens,
                 temperature=self.temperature,
@@ -108,13 +146,23 @@ class ClaudeClient:
                         "content": user_prompt,
                     }
                 ],
-            )
+            ) as stream:
+                for _ in stream.text_stream:
+                    if first_token_at is None:
+                        first_token_at = time.time()
+                    if should_abort is not None and should_abort():
+                        # Leaving the block closes the stream (and connection)
+                        logger.info("Claude request aborted by caller")
+                        print(f"  [STOP] Request cancelled", flush=True)
+                        return None
+                response = stream.get_final_message()
 
             elapsed = time.time() - start_time
-            logger.info(f"Received Claude response in {elapsed:.2f}s")
+            ttft = (first_token_at - start_time) if first_token_at is not None else elapsed
+            logger.info(f"Received Claude response in {elapsed:.2f}s (first token after {ttft:.2f}s)")
 
             # Console output for user visibility
-            print(f"  [OK] Response received in {elapsed:.2f}s", flush=True)
+            print(f"  [OK] Response received in {elapsed:.2f}s (first token after {ttft:.2f}s)", flush=True)
 
             # Extract response text
             if response.content and len(response.content) > 0:
@@ -124,12 +172,26 @@ class ClaudeClient:
 
                 # Log token usage
                 if hasattr(response, 'usage'):
+                    usage = response.usage
+                    self.last_usage = {
+                        "input_tokens": usage.input_tokens,
+                        "output_tokens": usage.output_tokens,
+                        "cache_read_input_tokens": getattr(usage, "cache_read_input_tokens", None) or 0,
+                        "cache_creation_input_tokens": getattr(usage, "cache_creation_input_tokens", None) or 0,
+                    }
                     logger.info(
-                        f"Token usage: input={response.usage.input_tokens}, "
-                        f"output={response.usage.output_tokens}"
+                        f"Token usage: input={usage.input_tokens}, "
+                        f"output={usage.output_tokens}, "
+                        f"cache_read={self.last_usage['cache_read_input_tokens']}, "
+                        f"cache_write={self.last_usage['cache_creation_input_tokens']}"
                     )
                     # Console output for token usage
-                    print(f"  [OK] Tokens used: {response.usage.input_tokens} in, {response.usage.output_tokens} out", flush=True)
+                    print(
+                        f"  [OK] Tokens used: {usage.input_tokens} in, {usage.output_tokens} out "
+                        f"(cache: {self.last_usage['cache_read_input_tokens']} read, "
+                        f"{self.last_usage['cache_creation_input_tokens']} written)",
+                        flush=True
+                    )
 
                 return response_text
             else:
@@ -13,6 +13,13 @@ import logging
 
 from pydantic import BaseModel, Field, field_validator, ValidationError
 
+try:
+    # orjson is optional; its JSONDecodeError subclasses json.JSONDecodeError,
+    # so the handlers below work with either backend
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 
 logger = logging.getLogger(__name__)
 
@@ -120,14 +127,14 @@ class ResponseParser:
         """
         try:
             # Try direct JSON parse first
-            return json.loads(response_text)
+            return _json_loads(response_text)
 
         except json.JSONDecodeError:
             # Try to extract JSON from markdown code block
             json_match = re.search(r'```json\s*(\{.*?\})\s*```', response_text, re.DOTALL)
             if json_match:
                 try:
-                    return json.loads(json_match.group(1))
+                    return _json_loads(json_match.group(1))
                 except json.JSONDecodeError:
                     pass
 
@@ -135,7 +142,7 @@ class ResponseParser:
             json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
             if json_match:
                 try:
-                    return json.loads(json_match.group(0))
+                    return _json_loads(json_match.group(0))
                 except json.JSONDecodeError:
                     pass
 
@@ -1,14 +1,314 @@
 import json
+import sys
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, field
+from functools import lru_cache, partial
+from operator import attrgetter
+from typing import Any, Callable, ClassVar, Dict, Final, List, Mapping, NamedTuple, Optional, Tuple, Union
+from dataclasses import dataclass
 
-import pandas as pd
 import numpy as np
 
+from data._njit import njit
 from llm.prompt_presets import get_preset, PromptPreset
 
-@dataclass
+# Row templates for the per-record prompt lines; the format specs are parsed
+# once here instead of on every row.
+_TRADE_ROW = "  {coin} ({side}) - Entry: ${entry:.2f} → Exit: {exit_price} | P&L: ${pnl:+.2f}\n"
+_EXIT_PRICE = "${:.2f}"
+_LEVERAGE_LIMIT_ROW = "  - {}: MAX {}x leverage\n"
+_DECISION_ROW = "  {coin} - {signal} (confidence: {confidence:.0%})\n    Reason: {justification}\n"
+
+# Fixed section headers (each followed by its blank line), interned once so
+# every rendered prompt reuses the same objects.
+_HDR_MARKET: Final[str] = sys.intern("### CURRENT MARKET DATA\n\n")
+_HDR_ACCOUNT: Final[str] = sys.intern("### ACCOUNT INFORMATION & PERFORMANCE\n\n")
+_HDR_INTRADAY: Final[str] = sys.intern("**Intraday series (oldest → latest):**\n\n")
+_HDR_OI_FUNDING: Final[str] = sys.intern("Open Interest & Funding Rate:\n")
+_HDR_POSITIONS: Final[str] = sys.intern("CURRENT LIVE POSITIONS:\n\n")
+_HDR_LIVE_MARKS: Final[str] = sys.intern("LIVE MARKS:\n\n")
+_HDR_TRADE_HISTORY: Final[str] = sys.intern("RECENT TRADE HISTORY (Last 10 Closed Positions):\n\n")
+_HDR_DECISIONS: Final[str] = sys.intern("YOUR RECENT DECISIONS (Last 5):\n\n")
+# Row bounds promised by the two headers above (inputs are newest first)
+_TRADE_HISTORY_LIMIT: Final[int] = 10
+_DECISIONS_LIMIT: Final[int] = 5
+_SEP: Final[str] = sys.intern("---\n\n")
+
+# Rows of each intraday series shown in a market section, and the columns
+# whose latest value is echoed in the section header.
+_SERIES_WINDOW: Final[int] = 15
+_HEADER_COLUMNS: Final[Tuple[str, ...]] = ('ema_20', 'macd', 'rsi_7')
+# Decimals kept in each intraday series: price-scale EMAs and 0-100 RSIs
+# don't need more than cents/hundredths, volume is shown in whole units.
+# Anything else (MACD, ATR, ...) keeps _DEFAULT_DECIMALS.
+_INDICATOR_DECIMALS: Final[Mapping[str, int]] = {
+    'ema_20': 2, 'ema_50': 2, 'rsi_7': 2, 'rsi_14': 2, 'volume': 0,
+}
+_DEFAULT_DECIMALS: Final[int] = 3
+
+# Rendered market sections, shared by all builders (see
+# PromptBuilder.format_market_data). Guarded by a lock since builders may be
+# used from several threads (e.g. web request handlers).
+_MARKET_SECTION_CACHE_SIZE = 128
+_MARKET_SECTION_CACHE: "OrderedDict[tuple, str]" = OrderedDict()
+_MARKET_SECTION_LOCK = threading.Lock()
+# DataFrames whose converted arrays each builder keeps (one per coin, with room
+# for a previous cycle's frames)
+_FRAME_CACHE_SIZE = 16
+# Account sections each builder keeps (consecutive quiet cycles hit the last)
+_ACCOUNT_CACHE_SIZE = 4
+
+
+# Example decision shown in the system prompt's output-format section.
+# Serialized once at import so it is always valid JSON.
+_OUTPUT_FORMAT_EXAMPLE: Final[str] = json.dumps({
+    "coin": "BTC/USDC:USDC",
+    "signal": "buy_to_enter|sell_to_enter|hold|close",
+    "quantity_usd": 50.0,
+    "leverage": 2.0,
+    "confidence": 0.75,
+    "exit_plan": {
+        "profit_target": 0.0,
+        "stop_loss": 0.0,
+        "invalidation_condition": "Reason text",
+    },
+    "justification": "Clear technical analysis reasoning",
+}, indent=4)
+
+# Static tail of the system prompt. Nothing in here depends on the trading
+# config or preset, so it is sent as its own block after the per-config
+# header and carries the system prompt's cache breakpoint (see
+# PromptBuilder.get_system_prompt_blocks).
+_STATIC_SYSTEM_TAIL: Final[str] = f"""## Learning from Trade History
+
+**CRITICAL:** You will receive your RECENT TRADE HISTORY and RECENT DECISIONS in each prompt. USE THIS DATA to improve your performance:
+
+1. **Identify Patterns in Losses:**
+   - What setups consistently lose money?
+   - Are you entering too early/late?
+   - Are your stop losses too tight or too loose?
+
+2. **Replicate Winning Trades:**
+   - What conditions led to your profitable trades?
+   - What indicators were aligned?
+   - What was different about your high-confidence wins vs losses?
+
+3. **Avoid Repeating Mistakes:**
+   - If you've been stopped out 2+ times on the same coin/pattern, STOP trading that setup
+   - If a specific justification/reasoning led to losses, don't use it again
+   - Learn from your own recent decisions - if a strategy isn't working, adapt
+
+4. **Track Your Performance:**
+   - Your realized P&L shows your actual track record
+   - If you're down money, your current approach ISN'T WORKING - change it
+   - If you're up money, double down on what's working
+
+**REMEMBER:** Past performance = your best teacher. Don't make the same mistake twice.
+
+## Output Format
+Return valid JSON with these exact fields:
+{_OUTPUT_FORMAT_EXAMPLE}
+
+CRITICAL: Use the EXACT symbol format from the market data section (e.g., "BTC/USDC:USDC", "ETH/USDC:USDC", "ARB/USDC:USDC", "SOL/USDC:USDC"). Do NOT shorten to "BTC", "ETH", "ARB" etc.
+
+IMPORTANT: Data provided below is ordered OLDEST → NEWEST."""
+
+
+class PositionView(NamedTuple):
+    """
+    Read-only view of an open position, as rendered in the prompt.
+
+    Built once from the position dicts produced by the account/exchange
+    layers so the formatters use attribute access instead of repeated
+    dict lookups.
+    """
+    coin: str
+    side: str
+    entry_price: float
+    current_price: float
+    quantity_usd: float
+    leverage: float
+    unrealized_pnl: float
+    profit_target: Optional[float] = None
+    stop_loss: Optional[float] = None
+    entry_time: Optional[str] = None
+    # Entry time as epoch seconds, when the producer recorded it
+    entry_ts: Optional[float] = None
+    time_open: Optional[str] = None
+    # True when the source dict carried an exit plan (even an empty one)
+    has_exit_plan: bool = False
+
+    @classmethod
+    def from_dict(cls, pos: Dict[str, Any]) -> "PositionView":
+        """Build a view from a position dict."""
+        get = pos.get
+        return cls(
+            coin=pos['coin'],
+            side=pos['side'],
+            entry_price=pos['entry_price'],
+            current_price=pos['current_price'],
+            quantity_usd=pos['quantity_usd'],
+            leverage=pos['leverage'],
+            unrealized_pnl=pos['unrealized_pnl'],
+            profit_target=get('profit_target'),
+            stop_loss=get('stop_loss'),
+            entry_time=get('entry_time'),
+            entry_ts=get('entry_ts'),
+            time_open=get('time_open'),
+            has_exit_plan='profit_target' in pos or 'stop_loss' in pos,
+        )
+
+
+_BY_COIN = attrgetter('coin')
+
+
+def from_dataframe(
+    df,
+    columns: Optional[Tuple[str, ...]] = None,
+    window: Optional[int] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Convert a DataFrame of indicators to the column -> ndarray mapping
+    taken by `PromptBuilder.format_market_data`.
+
+    Duck-typed (anything with `.columns` and column indexing) so this module
+    does not need to import pandas. Columns of a frame built from a 2-D
+    row-major array are strided views; they are copied to contiguous
+    arrays here once so every later slice/round reads sequential memory.
+
+    Args:
+        df: Indicator DataFrame (oldest row first)
+        columns: Only convert these columns (missing ones are skipped)
+        window: Only keep the last `window` rows of each column
+
+    Returns:
+        Dict of column name -> contiguous 1-D array
+    """
+    present = set(df.columns)
+    if columns is None:
+        columns = df.columns
+    start = -window if window else None
+    return {
+        col: np.ascontiguousarray(df[col].to_numpy()[start:])
+        for col in columns
+        if col in present
+    }
+
+
+def _series_length(indicators: Mapping[str, np.ndarray]) -> int:
+    """Number of rows in a column -> ndarray mapping (0 if no columns)."""
+    for values in indicators.values():
+        return len(values)
+    return 0
+
+
+@njit(cache=True)
+def _round_drop_nan(values, scale, out):
+    """
+    Write the non-NaN values of `values`, rounded to 1/scale, to the
+    front of `out` and return how many were written.
+
+    Mask, round and gather run as one compiled loop; rounding matches
+    `np.round(values, decimals)` for `scale == 10 ** decimals`.
+    """
+    k = 0
+    for v in values:
+        if v == v:
+            out[k] = np.rint(v * scale) / scale
+            k += 1
+    return k
+
+
+def _time_open_suffix(pos: PositionView, now_ts: float) -> str:
+    """
+    Render " | Time Open: 1h 5m" for a position ("" if its entry time is
+    unknown). `entry_ts` is used when present; legacy records only carry
+    the ISO `entry_time` string (naive UTC).
+    """
+    if pos.entry_ts is not None:
+        secs = int(now_ts - pos.entry_ts)
+    elif pos.entry_time:
+        try:
+            secs = int((datetime.utcnow() - datetime.fromisoformat(pos.entry_time)).total_seconds())
+        except (TypeError, ValueError):
+            return ""
+    else:
+        return ""
+
+    hours, rem = divmod(secs, 3600)
+    minutes = rem // 60
+    if hours > 0:
+        return f" | Time Open: {hours}h {minutes}m"
+    return f" | Time Open: {minutes}m"
+
+
+def _clean_round(values: np.ndarray, decimals: int, max_chars: Optional[int] = None) -> str:
+    """
+    Drop NaNs from a numeric column, round the rest and render it.
+
+    Works on the raw ndarray so no intermediate Series is built; the mask
+    and rounding each run as a single vectorized pass.
+
+    Args:
+        values: 1-D numeric array (float or int dtype)
+        decimals: Number of decimal places to keep
+        max_chars: Optional size budget for the rendered list (see
+            `_fit_to_budget`)
+
+    Returns:
+        Rendered list such as "[1.5, 2.25]" (empty string if all NaN)
+    """
+    if values.dtype.kind == 'f':
+        values = values[~np.isnan(values)]
+    if not len(values):
+        return ""
+    if max_chars is not None:
+        return _fit_to_budget(values, decimals, max_chars)
+    return str(np.round(values, decimals).tolist())
+
+
+def _fit_to_budget(values: np.ndarray, decimals: int, max_chars: int) -> str:
+    """
+    Round and render a numeric series so it fits in `max_chars`.
+
+    Precision is dropped one decimal at a time first (down to whole numbers,
+    emitted as ints when the series has no NaNs); if the list is still too
+    long, the oldest values are trimmed from the left. The list is rendered
+    once per attempt and that text is returned, so callers never repr the
+    values again.
+
+    Args:
+        values: 1-D numeric array, oldest first
+        decimals: Preferred number of decimal places
+        max_chars: Maximum length of the result
+
+    Returns:
+        Rendered list such as "[1.5, 2.25]"
+    """
+    rounded = np.round(values, decimals).tolist()
+    text = str(rounded)
+    while decimals > 0 and len(text) > max_chars:
+        decimals -= 1
+        if decimals == 0 and values.dtype.kind == 'f' and np.isfinite(values).all():
+            rounded = np.rint(values).astype(np.int64).tolist()
+        else:
+            rounded = np.round(values, decimals).tolist()
+        text = str(rounded)
+
+    length = len(text)
+    if length > max_chars:
+        # Each element costs its repr plus the ", " separator
+        start = 0
+        while length > max_chars and start < len(rounded) - 1:
+            length -= len(repr(rounded[start])) + 2
+            start += 1
+        text = str(rounded[start:])
+    return text
+
+
+@dataclass(frozen=True, slots=True)
 class TradingConfig:
     """
     Configuration for the trading session to ensure platform/exchange agnosticism.
@@ -19,7 +319,11 @@ class TradingConfig:
     max_leverage: float = 20.0
     preset_name: str = "aggressive_small_account"  # Default preset
     # The columns in the dataframe that should be highlighted in the prompt
-    relevant_indicators: List[str] = field(default_factory=lambda: ['ema_20', 'macd', 'rsi_7', 'rsi_14', 'volume'])
+    # Tuple (with the dataclass frozen) so configs are hashable and can key caches
+    relevant_indicators: Tuple[str, ...] = ('ema_20', 'macd', 'rsi_7', 'rsi_14', 'volume')
+    # Size budget (characters) for each rendered intraday series; longer
+    # series lose precision first, then their oldest values
+    max_chars_per_indicator: int = 400
 
 class PromptBuilder:
     """
@@ -27,24 +331,34 @@ class PromptBuilder:
     Now instantiated with a config to allow for dynamic constraints.
     """
 
-    def __init__(self, config: TradingConfig):
-        self.config = config
+    # Longest supervisor guidance passed through to the prompt
+    MAX_GUIDANCE_CHARS = 2048
 
-    def _generate_system_prompt_template(self) -> str:
-        """
-        Dynamically generates the system prompt based on constraints and selected preset.
-        """
-        # Get the selected preset
-        preset = get_preset(self.config.preset_name)
+    # Per-position templates for the account section; str.format parses the
+    # specs once per template rather than once per f-string field
+    _POS_LINE_TEMPLATE: ClassVar[str] = (
+        "Position: {coin} ({side})\n"
+        "  Entry: ${entry_price:,.2f}\n"
+        "  Size: ${quantity_usd:.2f} (Lev: {leverage}x)\n"
+        "{exit_plan}\n"
+    )
+    _POS_FOCUS_TEMPLATE: ClassVar[str] = (
+        "  - {coin}: {side} @ ${entry_price:,.2f}, Size: ${quantity_usd:.2f}, Leverage: {leverage}x{time_open}\n"
+    )
+    _POS_MARK_TEMPLATE: ClassVar[str] = (
+        "  {coin}: Current: ${current_price:,.2f} | Unrealized P&L: ${unrealized_pnl:+,.2f}{time_open}\n"
+    )
 
-        return f"""You are an autonomous cryptocurrency trading agent operating on the {self.config.exchange_name} exchange.
+    # Config/preset-dependent head of the system prompt, rendered with
+    # str.format_map; the static remainder is _STATIC_SYSTEM_TAIL.
+    _SYSTEM_TEMPLATE: ClassVar[str] = """You are an autonomous cryptocurrency trading agent operating on the {exchange_name} exchange.
 
 Your goal is to maximize profit and loss (PnL) while managing risk appropriately. You have been given real capital to trade.
 
 ## Operational Constraints (CRITICAL)
-- **Minimum Position Size:** ${self.config.min_position_size_usd:.2f} USD (Trades below this will fail).
-- **Maximum Leverage:** {self.config.max_leverage}x (Do not exceed this leverage unless told otherwise in strategy).
-- **Asset Class:** {self.config.asset_class}.
+- **Minimum Position Size:** ${min_position_size_usd:.2f} USD (Trades below this will fail).
+- **Maximum Leverage:** {max_leverage}x (Do not exceed this leverage unless told otherwise in strategy).
+- **Asset Class:** {asset_class}.
 
 ## Your Capabilities
 - Analyze technical indicators provided in the context.
@@ -52,137 +366,281 @@ Your goal is to maximize profit and loss (PnL) while managing risk appropriately
 - Manage multiple positions across different assets.
 
 ## Trading Rules
-1. STRICTLY adhere to the minimum position size of ${self.config.min_position_size_usd}.
+1. STRICTLY adhere to the minimum position size of ${min_position_size_usd}.
 2. Set clear exit plans for every position (profit target, stop loss, invalidation).
 3. Be explicit about confidence levels (0.0 to 1.0).
 4. Provide clear justification for every decision.
 
-{preset.strategy_section}
+{strategy_section}
 
-{preset.sizing_rules}
+{sizing_rules}
 
-{preset.risk_rules}
+{risk_rules}
 
-{preset.exit_rules}
+{exit_rules}
 
-## Learning from Trade History
+"""
 
-**CRITICAL:** You will receive your RECENT TRADE HISTORY and RECENT DECISIONS in each prompt. USE THIS DATA to improve your performance:
+    def __init__(self, config: TradingConfig):
+        self.config = config
+        # The system prompt only depends on the config, so render it once
+        self._system_prompt_header, self._system_prompt = self._render_system_prompt(config)
+
+        # Market-section rendering specialized for this config: each
+        # indicator's label and rounding scale are precomputed and the
+        # rounding helpers have their decimals/budget bound, so the
+        # per-column loop only slices and renders.
+        budget = config.max_chars_per_indicator
+        self._render_close = partial(_fit_to_budget, decimals=2, max_chars=budget)
+        self._indicator_specs = tuple(
+            (col, f"{col.upper()}: ", 10.0 ** decimals, partial(_clean_round, decimals=decimals, max_chars=budget))
+            for col in config.relevant_indicators
+            for decimals in (_INDICATOR_DECIMALS.get(col, _DEFAULT_DECIMALS),)
+        )
+        # Recently rendered account sections (see `_write_account_state`)
+        self._account_cache: "OrderedDict[tuple, str]" = OrderedDict()
+        # Recently converted DataFrames (see `_frame_arrays`)
+        self._frame_cache: "OrderedDict[Tuple[int, int], Tuple[Any, Dict[str, np.ndarray]]]" = OrderedDict()
+        # Start of every user prompt; only depends on the config
+        self._user_header = (
+            "Analyze the provided state data and predictive signals.\n"
+            f"REMINDER: Minimum order size is ${config.min_position_size_usd}.\n"
+            "\n"
+            f"{_SEP}{_HDR_MARKET}"
+        )
+        # Everything a market section reads, so DataFrame inputs only have
+        # these columns converted (the memo key needs 'timestamp' too)
+        self._render_columns = tuple(dict.fromkeys(
+            ('timestamp', 'close', *_HEADER_COLUMNS, *config.relevant_indicators)
+        ))
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _render_system_prompt(config: TradingConfig) -> Tuple[str, str]:
+        """
+        Render the system prompt for a config.
 
-1. **Identify Patterns in Losses:**
-   - What setups consistently lose money?
-   - Are you entering too early/late?
-   - Are your stop losses too tight or too loose?
+        Cached per (frozen, hashable) config across builder instances, since
+        a new builder is constructed whenever the config changes.
 
-2. **Replicate Winning Trades:**
-   - What conditions led to your profitable trades?
-   - What indicators were aligned?
-   - What was different about your high-confidence wins vs losses?
-
-3. **Avoid Repeating Mistakes:**
-   - If you've been stopped out 2+ times on the same coin/pattern, STOP trading that setup
-   - If a specific justification/reasoning led to losses, don't use it again
-   - Learn from your own recent decisions - if a strategy isn't working, adapt
+        Returns:
+            (config/preset-dependent header, full system prompt)
+        """
+        # Get the selected preset
+        preset = get_preset(config.preset_name)
+
+        header = PromptBuilder._SYSTEM_TEMPLATE.format_map({
+            "exchange_name": config.exchange_name,
+            "min_position_size_usd": config.min_position_size_usd,
+            "max_leverage": config.max_leverage,
+            "asset_class": config.asset_class,
+            "strategy_section": preset.strategy_section,
+            "sizing_rules": preset.sizing_rules,
+            "risk_rules": preset.risk_rules,
+            "exit_rules": preset.exit_rules,
+        })
+        # Interned so builders with the same config hand back the same
+        # object, letting callers short-circuit prompt comparisons with `is`.
+        return header, sys.intern(header + _STATIC_SYSTEM_TAIL)
 
-4. **Track Your Performance:**
-   - Your realized P&L shows your actual track record
-   - If you're down money, your current approach ISN'T WORKING - change it
-   - If you're up money, double down on what's working
+    def format_market_data(
+        self,
+        symbol: str,
+        current_price: float,
+        indicators: Mapping[str, np.ndarray],
+        funding_rate: Optional[float] = None,
+        open_interest: Optional[float] = None,
+    ) -> str:
+        """
+        Format market data for a single asset.
 
-**REMEMBER:** Past performance = your best teacher. Don't make the same mistake twice.
+        Sections are memoized on everything that can change the output (see
+        `_market_section_key`), so repeated calls within the same candle skip
+        the NumPy work entirely.
 
-## Output Format
-Return valid JSON with these exact fields:
-{{
-    "coin": "BTC/USDC:USDC",
-    "signal": "buy_to_enter|sell_to_enter|hold|close",
-    "quantity_usd": 50.0,
-    "leverage": 2.0,
-    "confidence": 0.75,
-    "exit_plan": {{
-        "profit_target": 0.0,
-        "stop_loss": 0.0,
-        "invalidation_condition": "Reason text"
-    }},
-    "justification": "Clear technical analysis reasoning"
-}}
+        Args:
+            symbol: Trading pair symbol
+            current_price: Latest price
+            indicators: Column name -> 1-D array (oldest first). DataFrames
+                are still accepted; only the rendered columns and the last
+                `_SERIES_WINDOW` rows are converted with `from_dataframe`.
+            funding_rate: Optional funding rate
+            open_interest: Optional open interest
+        """
+        if hasattr(indicators, 'columns'):
+            indicators = self._frame_arrays(indicators) if len(indicators) else {}
+
+        # No candles: only the header lines are rendered, which is cheaper
+        # than building a memo key
+        if not _series_length(indicators):
+            return self._render_market_data(symbol, current_price, {}, funding_rate, open_interest)
+
+        key = self._market_section_key(symbol, current_price, indicators, funding_rate, open_interest)
+        with _MARKET_SECTION_LOCK:
+            section = _MARKET_SECTION_CACHE.get(key)
+            if section is not None:
+                _MARKET_SECTION_CACHE.move_to_end(key)
+                return section
+
+        section = self._render_market_data(symbol, current_price, indicators, funding_rate, open_interest)
+
+        with _MARKET_SECTION_LOCK:
+            _MARKET_SECTION_CACHE[key] = section
+            if len(_MARKET_SECTION_CACHE) > _MARKET_SECTION_CACHE_SIZE:
+                _MARKET_SECTION_CACHE.popitem(last=False)
+        return section
+
+    def _frame_arrays(self, df) -> Dict[str, np.ndarray]:
+        """
+        Convert a DataFrame with `from_dataframe`, once per frame object.
 
-CRITICAL: Use the EXACT symbol format from the market data section (e.g., "BTC/USDC:USDC", "ETH/USDC:USDC", "ARB/USDC:USDC", "SOL/USDC:USDC"). Do NOT shorten to "BTC", "ETH", "ARB" etc.
+        Repeated calls with the same frame (e.g. a prompt rebuilt after a
+        failed request) reuse the arrays. Frames are treated as immutable
+        once formatted; the cache keeps a reference to each frame so its
+        `id()` cannot be recycled while cached.
+        """
+        key = (id(df), len(df))
+        with _MARKET_SECTION_LOCK:
+            hit = self._frame_cache.get(key)
+            if hit is not None and hit[0] is df:
+                self._frame_cache.move_to_end(key)
+                return hit[1]
+
+        arrays = from_dataframe(df, self._render_columns, _SERIES_WINDOW)
+
+        with _MARKET_SECTION_LOCK:
+            self._frame_cache[key] = (df, arrays)
+            if len(self._frame_cache) > _FRAME_CACHE_SIZE:
+                self._frame_cache.popitem(last=False)
+        return arrays
+
+    def _market_section_key(
+        self,
+        symbol: str,
+        current_price: float,
+        indicators: Mapping[str, np.ndarray],
+        funding_rate: Optional[float],
+        open_interest: Optional[float],
+    ) -> tuple:
+        """
+        Build the memo key for a (non-empty) market section.
 
-IMPORTANT: Data provided below is ordered OLDEST → NEWEST."""
+        Only the last bar can still be forming, so the series are identified
+        by their length, last timestamp and the raw bytes of the last value
+        in every rendered column (bytes rather than floats so NaN compares
+        equal).
+        """
+        last_ts = indicators['timestamp'][-1:].tobytes() if 'timestamp' in indicators else None
+        last_bar = (last_ts,) + tuple(
+            indicators[col][-1:].tobytes()
+            for col in ('close', *self.config.relevant_indicators)
+            if col in indicators
+        )
+        return (
+            symbol,
+            self.config.relevant_indicators,
+            self.config.max_chars_per_indicator,
+            _series_length(indicators),
+            last_bar,
+            current_price,
+            funding_rate,
+            open_interest,
+        )
 
-    def format_market_data(
+    def _render_market_data(
         self,
         symbol: str,
         current_price: float,
-        indicators_df: pd.DataFrame,
+        indicators: Mapping[str, np.ndarray],
         funding_rate: Optional[float] = None,
         open_interest: Optional[float] = None,
     ) -> str:
         """
-        Format market data for a single asset.
+        Render the market data section for a single asset (uncached).
         """
-        lines = []
-        lines.append(f"### {symbol} DATA")
-        lines.append("")
-
-        # Current state
-        latest = indicators_df.iloc[-1] if not indicators_df.empty else {}
-        
-        # specific header stats
+        parts: List[str] = []
+        w = parts.append
+        w(f"### {symbol} DATA\n")
+        w("\n")
+
+        # Resolve which columns are present once, instead of repeated
+        # membership tests in each loop below
+        columns = indicators.keys()
+        has_rows = _series_length(indicators) > 0
+        header_cols = [col for col in _HEADER_COLUMNS if col in columns]
+
+        # specific header stats: the last value of each header column is
+        # read straight off its array and formatted in the same pass
         header_stats = [f"current_price = {current_price:.2f}"]
-        for col in ['ema_20', 'macd', 'rsi_7']:
-            if col in latest:
-                val = latest[col]
+        if has_rows:
+            for col in header_cols:
+                val = indicators[col][-1]
                 header_stats.append(f"current_{col} = {val:.4f}" if isinstance(val, (float, int)) else f"current_{col} = {val}")
-        
-        lines.append(", ".join(header_stats))
-        lines.append("")
+
+        w(", ".join(header_stats))
+        w("\n\n")
 
         # Funding rate and open interest
         if funding_rate is not None or open_interest is not None:
-            lines.append(f"Open Interest & Funding Rate:")
+            w(_HDR_OI_FUNDING)
             if open_interest is not None:
-                lines.append(f"Open Interest: Latest: {open_interest:.2f}")
+                w(f"Open Interest: Latest: {open_interest:.2f}\n")
             if funding_rate is not None:
-                lines.append(f"Funding Rate: {funding_rate:.8f}")
-            lines.append("")
+                w(f"Funding Rate: {funding_rate:.8f}\n")
+            w("\n")
 
         # Intraday series
-        lines.append("**Intraday series (oldest → latest):**")
-        lines.append("")
-
-        if not indicators_df.empty:
-            # We take the last 15 rows for context
-            last_n = indicators_df.tail(15)
+        w(_HDR_INTRADAY)
 
+        if has_rows:
+            # We take the last _SERIES_WINDOW rows for context
             # Prices
-            if 'close' in last_n.columns:
-                prices = last_n['close'].tolist()
-                lines.append(f"Close prices: {[round(p, 2) for p in prices]}")
-                lines.append("")
+            if 'close' in columns:
+                prices = indicators['close'][-_SERIES_WINDOW:]
+                if prices.dtype.kind in 'fiu':
+                    rendered = self._render_close(prices)
+                else:
+                    rendered = str(prices.tolist())
+                w(f"Close prices: {rendered}\n")
+                w("\n")
 
             # Dynamic Indicator Formatting
             # This iterates through columns defined in config, making it model-agnostic
-            for col in self.config.relevant_indicators:
-                if col in last_n.columns:
-                    # Clean nans and round
-                    vals = last_n[col].dropna().tolist()
-                    if vals:
-                        rounded = [round(v, 3) if isinstance(v, (int, float)) else v for v in vals]
-                        lines.append(f"{col.upper()}: {rounded}")
-                        lines.append("")
-
-        lines.append("---")
-        lines.append("")
-
-        return "\n".join(lines)
+            # float64 columns go through the `_round_drop_nan` kernel into a
+            # reused buffer; other dtypes are handled per column below
+            present = [spec for spec in self._indicator_specs if spec[0] in columns]
+            out = np.empty(_SERIES_WINDOW)
+
+            budget = self.config.max_chars_per_indicator
+            for col, label, scale, render in present:
+                values = indicators[col][-_SERIES_WINDOW:]
+                # Clean nans and round (non-numeric columns are passed through)
+                if values.dtype == np.float64:
+                    k = _round_drop_nan(values, scale, out)
+                    kept = out[:k]
+                    if scale == 1.0:
+                        # Whole units render without a trailing ".0"
+                        kept = kept.astype(np.int64)
+                    rendered = str(kept.tolist()) if k else ""
+                    if len(rendered) > budget:
+                        rendered = render(values)
+                elif values.dtype.kind in 'fiu':
+                    rendered = render(values)
+                else:
+                    kept = [v for v in values.tolist() if v is not None and v == v]
+                    rendered = str(kept) if kept else ""
+                if rendered:
+                    w(f"{label}{rendered}\n\n")
+
+        w(_SEP)
+
+        return "".join(parts)
 
     def format_account_state(
         self,
         available_cash: float,
         total_value: float,
-        positions: List[Dict[str, Any]],
+        positions: List[Union[PositionView, Dict[str, Any]]],
         total_return_pct: float,
         sharpe_ratio: float,
         trade_history: Optional[List[Dict[str, Any]]] = None,
@@ -190,86 +648,181 @@ IMPORTANT: Data provided below is ordered OLDEST → NEWEST."""
     ) -> str:
         """
         Format current account state.
+
+        Positions may be PositionView tuples or the plain dicts produced by
+        the account/exchange layers; dicts are converted once here.
+        """
+        positions = [PositionView.from_dict(p) if isinstance(p, dict) else p for p in positions]
+        parts: List[str] = []
+        self._write_account_state(
+            parts.append,
+            available_cash,
+            total_value,
+            positions,
+            total_return_pct,
+            sharpe_ratio,
+            trade_history,
+            recent_decisions,
+        )
+        return "".join(parts)
+
+    def _write_account_state(
+        self,
+        w: Callable[[str], Any],
+        available_cash: float,
+        total_value: float,
+        positions: List[PositionView],
+        total_return_pct: float,
+        sharpe_ratio: float,
+        trade_history: Optional[List[Dict[str, Any]]] = None,
+        recent_decisions: Optional[List[Dict[str, Any]]] = None,
+    ) -> None:
+        """
+        Write the account state section through `w` (e.g. a list's append;
+        the caller joins the pieces once).
+
+        The section is memoized on its rendered inputs (including each
+        position's time-open text), so quiet cycles with no fills or price
+        moves reuse the previous text.
+        """
+        positions = sorted(positions, key=_BY_COIN)
+        now_ts = time.time()
+        time_opens = [_time_open_suffix(pos, now_ts) for pos in positions]
+        trade_history = trade_history[:_TRADE_HISTORY_LIMIT] if trade_history else None
+        recent_decisions = recent_decisions[:_DECISIONS_LIMIT] if recent_decisions else None
+
+        try:
+            key = (
+                available_cash, total_value, total_return_pct, sharpe_ratio,
+                tuple(positions), tuple(time_opens),
+                tuple(tuple(t.items()) for t in trade_history or ()),
+                tuple(tuple(d.items()) for d in recent_decisions or ()),
+            )
+            hash(key)
+        except TypeError:
+            # Unhashable field values (not produced by the bot's own layers)
+            key = None
+
+        section = self._account_cache.get(key) if key is not None else None
+        if section is None:
+            parts: List[str] = []
+            self._render_account_state(
+                parts.append, available_cash, total_value, positions, time_opens,
+                total_return_pct, sharpe_ratio, trade_history, recent_decisions,
+            )
+            section = "".join(parts)
+            if key is not None:
+                self._account_cache[key] = section
+                if len(self._account_cache) > _ACCOUNT_CACHE_SIZE:
+                    self._account_cache.popitem(last=False)
+        else:
+            self._account_cache.move_to_end(key)
+        w(section)
+
+    def _render_account_state(
+        self,
+        w: Callable[[str], Any],
+        available_cash: float,
+        total_value: float,
+        positions: List[PositionView],
+        time_opens: List[str],
+        total_return_pct: float,
+        sharpe_ratio: float,
+        trade_history: Optional[List[Dict[str, Any]]],
+        recent_decisions: Optional[List[Dict[str, Any]]],
+    ) -> None:
+        """
+        Render the account state section (uncached). Positions are sorted by
+        coin and the history lists already cut to their header bounds.
         """
-        lines = []
-        lines.append("### ACCOUNT INFORMATION & PERFORMANCE")
-        lines.append("")
-        lines.append(f"Current Total Return: {total_return_pct:.2f}%")
-        lines.append(f"Available Cash: ${available_cash:.2f}")
-        lines.append(f"Total Account Value: ${total_value:.2f}")
-        lines.append("")
+        w(_HDR_ACCOUNT)
+        w(f"Current Total Return: {total_return_pct:.2f}%\n")
+        w(f"Available Cash: ${available_cash:.2f}\n")
+        w(f"Total Account Value: ${total_value:.2f}\n")
+        w("\n")
 
         if positions:
-            lines.append("CURRENT LIVE POSITIONS:")
-            lines.append("")
+            # Sorted, static fields first: this block stays byte-identical
+            # across ticks while the position set is unchanged. Per-tick
+            # marks (price, P&L, time open) follow in their own block.
+            w(_HDR_POSITIONS)
+            format_line = self._POS_LINE_TEMPLATE.format
             for pos in positions:
-                # Basic info
-                lines.append(f"Position: {pos['coin']} ({pos['side'].upper()})")
-                lines.append(f"  Entry: ${pos['entry_price']:,.2f} | Current: ${pos['current_price']:,.2f}")
-                lines.append(f"  Size: ${pos['quantity_usd']:.2f} (Lev: {pos['leverage']}x)")
-                lines.append(f"  Unrealized P&L: ${pos['unrealized_pnl']:+,.2f}")
-
-                # Show how long position has been open
-                if pos.get('entry_time'):
-                    from datetime import datetime
-                    try:
-                        entry_time = datetime.fromisoformat(pos['entry_time'])
-                        now = datetime.utcnow()
-                        duration = now - entry_time
-                        hours = int(duration.total_seconds() // 3600)
-                        minutes = int((duration.total_seconds() % 3600) // 60)
-
-                        if hours > 0:
-                            duration_str = f"{hours}h {minutes}m"
-                        else:
-                            duration_str = f"{minutes}m"
-
-                        lines.append(f"  Time Open: {duration_str}")
-                    except:
-                        pass
-
                 # Check for exit plans
-                if 'profit_target' in pos or 'stop_loss' in pos:
-                     lines.append("  Exit Plan:")
-                     if pos.get('profit_target'):
-                         lines.append(f"    - Target: ${pos['profit_target']:,.2f}")
-                     if pos.get('stop_loss'):
-                         lines.append(f"    - Stop: ${pos['stop_loss']:,.2f}")
-
-                lines.append("")
+                exit_plan = ""
+                if pos.has_exit_plan:
+                    profit_target = pos.profit_target
+                    stop_loss = pos.stop_loss
+                    exit_plan = "  Exit Plan:\n"
+                    if profit_target:
+                        exit_plan += f"    - Target: ${profit_target:,.2f}\n"
+                    if stop_loss:
+                        exit_plan += f"    - Stop: ${stop_loss:,.2f}\n"
+
+                # One write per position, including the blank separator line
+                w(format_line(
+                    coin=pos.coin,
+                    side=pos.side.upper(),
+                    entry_price=pos.entry_price,
+                    quantity_usd=pos.quantity_usd,
+                    leverage=pos.leverage,
+                    exit_plan=exit_plan,
+                ))
+
+            w(_HDR_LIVE_MARKS)
+            format_mark = self._POS_MARK_TEMPLATE.format
+            for pos, time_open in zip(positions, time_opens):
+                w(format_mark(
+                    coin=pos.coin,
+                    current_price=pos.current_price,
+                    unrealized_pnl=pos.unrealized_pnl,
+                    time_open=time_open,
+                ))
+            w("\n")
         else:
-            lines.append("No active positions.")
-            lines.append("")
+            w("No active positions.\n\n")
 
-        lines.append(f"Risk Metric (Sharpe): {sharpe_ratio:.3f}")
-        lines.append("")
+        w(f"Risk Metric (Sharpe): {sharpe_ratio:.3f}\n\n")
 
         # Show recent trade history for learning
         if trade_history:
-            lines.append("RECENT TRADE HISTORY (Last 10 Closed Positions):")
-            lines.append("")
-            for trade in trade_history:
-                if trade.get('realized_pnl') is not None:
-                    pnl_str = f"${trade['realized_pnl']:+.2f}"
-                    entry = f"${trade.get('entry_price', 0):.2f}"
-                    exit_price = f"${trade.get('exit_price', 0):.2f}" if trade.get('exit_price') else "N/A"
-                    lines.append(f"  {trade['coin']} ({trade['side']}) - Entry: {entry} → Exit: {exit_price} | P&L: {pnl_str}")
-            lines.append("")
+            w(_HDR_TRADE_HISTORY)
+            closed = (t for t in trade_history if t.get('realized_pnl') is not None)
+            for trade in closed:
+                get = trade.get
+                exit_price = get('exit_price')
+                w(_TRADE_ROW.format(
+                    coin=trade['coin'],
+                    side=trade['side'],
+                    entry=get('entry_price', 0),
+                    exit_price=_EXIT_PRICE.format(exit_price) if exit_price else "N/A",
+                    pnl=trade['realized_pnl'],
+                ))
+            w("\n")
 
         # Show recent decisions for context
         if recent_decisions:
-            lines.append("YOUR RECENT DECISIONS (Last 5):")
-            lines.append("")
+            w(_HDR_DECISIONS)
             for decision in recent_decisions:
-                signal = decision.get('signal', 'unknown')
-                coin = decision.get('coin', 'unknown')
-                confidence = decision.get('confidence', 0)
-                justification = decision.get('justification', 'No justification')[:80]  # Truncate long justifications
-                lines.append(f"  {coin} - {signal.upper()} (confidence: {confidence:.0%})")
-                lines.append(f"    Reason: {justification}")
-            lines.append("")
-
-        return "\n".join(lines)
+                get = decision.get
+                w(_DECISION_ROW.format(
+                    coin=get('coin', 'unknown'),
+                    signal=get('signal', 'unknown').upper(),
+                    confidence=get('confidence', 0),
+                    justification=get('justification', 'No justification')[:80],  # Truncate long justifications
+                ))
+            w("\n")
+
+    def _format_market_item(self, item) -> str:
+        """Format one (symbol, data) entry of the market_data dict."""
+        symbol, data = item
+        return self.format_market_data(
+            symbol=symbol,
+            current_price=data.get('current_price', 0),
+            indicators=data.get('indicators', {}),
+            funding_rate=data.get('funding_rate'),
+            open_interest=data.get('open_interest'),
+        )
 
     def build_trading_prompt(
         self,
@@ -289,99 +842,186 @@ IMPORTANT: Data provided below is ordered OLDEST → NEWEST."""
             user_guidance: Optional supervisor input
             leverage_limits: Optional dict of {symbol: max_leverage}
         """
-        lines = []
+        blocks = self.build_trading_prompt_blocks(
+            market_data,
+            account_state,
+            minutes_since_start,
+            user_guidance=user_guidance,
+            leverage_limits=leverage_limits,
+        )
+        return "".join(block["text"] for block in blocks)
 
-        # Header
-        lines.append(f"Trading Session Duration: {minutes_since_start} minutes.")
-        lines.append("Analyze the provided state data and predictive signals.")
-        lines.append(f"REMINDER: Minimum order size is ${self.config.min_position_size_usd}.")
+    def build_trading_prompt_blocks(
+        self,
+        market_data: Dict[str, Dict],
+        account_state: Dict[str, Any],
+        minutes_since_start: int = 0,
+        user_guidance: Optional[str] = None,
+        leverage_limits: Optional[Dict[str, int]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Build the User Prompt as Anthropic message content blocks.
 
-        # Show per-coin leverage limits if provided
-        if leverage_limits:
-            lines.append("")
-            lines.append("LEVERAGE LIMITS PER ASSET:")
-            for symbol, max_lev in leverage_limits.items():
-                lines.append(f"  - {symbol}: MAX {max_lev}x leverage")
+        Blocks are ordered from most to least stable: header (config only),
+        one block per coin, then a tail with everything that changes every
+        cycle (account state, position focus, guidance, session duration,
+        leverage limits). The header and the last market block
+        carry `cache_control` breakpoints so consecutive requests can reuse
+        the cached prefix (the API allows at most 4 breakpoints per request,
+        so coins are not marked individually). Joining the block texts gives
+        exactly the string returned by `build_trading_prompt`.
 
-        lines.append("")
-        
-        # Supervisor Guidance (High Priority)
-        if user_guidance:
-            lines.append("!!! SUPERVISOR GUIDANCE (HIGH PRIORITY) !!!")
-            lines.append("The human supervisor has provided the following context/instruction:")
-            lines.append(f"> \"{user_guidance}\"")
-            lines.append("You MUST consider this input in your analysis and decision making.")
-            lines.append("If this guidance contradicts standard rules, prioritize this guidance (within safety limits).")
-            lines.append("")
+        Args:
+            market_data: Market data for each symbol
+            account_state: Current account state
+            minutes_since_start: Minutes since bot started
+            user_guidance: Optional supervisor input
+            leverage_limits: Optional dict of {symbol: max_leverage}
 
-        # Trading Focus Instructions
-        positions = account_state.get('positions', [])
-        max_positions = account_state.get('max_positions', 3)  # Default to 3 if not provided
+        Returns:
+            List of {"type": "text", "text": ...} content blocks
+        """
+        # Header: depends only on the config, so it is a stable prefix
+        blocks = [{"type": "text", "text": self._user_header, "cache_control": {"type": "ephemeral"}}]
 
-        if positions:
-            lines.append("!!! POSITION MANAGEMENT FOCUS !!!")
-            lines.append(f"You currently have {len(positions)} of {max_positions} OPEN position(s):")
-            for pos in positions:
-                time_open = f" ({pos.get('time_open', 'N/A')})" if pos.get('time_open') else ""
-                lines.append(f"  - {pos['coin']}: {pos['side'].upper()} @ ${pos['entry_price']:,.2f}, Size: ${pos['quantity_usd']:.2f}, Leverage: {pos['leverage']}x{time_open}")
-            lines.append("")
+        # Add market data for each asset
+        for item in market_data.items():
+            blocks.append({"type": "text", "text": self._format_market_item(item)})
 
-            if len(positions) >= max_positions:
-                lines.append(f"⚠️  POSITION LIMIT REACHED ({len(positions)}/{max_positions})")
-                lines.append("You CANNOT open new positions until you close an existing one.")
-                lines.append("Your options:")
-                lines.append("  1. HOLD one of your existing positions")
-                lines.append("  2. CLOSE a position to free up a slot")
-                lines.append("")
-                lines.append("Do NOT choose buy_to_enter or sell_to_enter - you're at max capacity!")
-            else:
-                lines.append(f"POSITION CAPACITY: {len(positions)}/{max_positions} slots used")
-                lines.append("Your options:")
-                lines.append("  1. HOLD or CLOSE existing positions")
-                lines.append(f"  2. Open NEW positions in different coins (you have {max_positions - len(positions)} slot(s) available)")
-                lines.append("")
-                lines.append("Multiple positions across different coins is ALLOWED and ENCOURAGED for diversification.")
-                lines.append("Don't close winning positions prematurely just to open a new one!")
-            lines.append("")
-
-        lines.append("---")
-        lines.append("")
-
-        # Current market state
-        lines.append("### CURRENT MARKET DATA")
-        lines.append("")
+        if len(blocks) > 1:
+            blocks[-1]["cache_control"] = {"type": "ephemeral"}
 
-        # Add market data for each asset
-        for symbol, data in market_data.items():
-            market_section = self.format_market_data(
-                symbol=symbol,
-                current_price=data.get('current_price', 0),
-                indicators_df=data.get('indicators', pd.DataFrame()),
-                funding_rate=data.get('funding_rate'),
-                open_interest=data.get('open_interest'),
+        # Everything that changes from cycle to cycle goes in the tail block
+        tail: List[str] = []
+        w = tail.append
+
+        # Position dicts are converted to PositionView once, here at the boundary
+        positions = account_state.get('positions')
+        if positions:
+            positions = sorted(
+                (PositionView.from_dict(p) if isinstance(p, dict) else p for p in positions),
+                key=_BY_COIN,
             )
-            lines.append(market_section)
+        else:
+            positions = []
 
-        # Account state
-        account_section = self.format_account_state(
+        # Account state, appended straight to the tail block's parts
+        self._write_account_state(
+            w,
             available_cash=account_state.get('available_cash', 0),
             total_value=account_state.get('total_value', 0),
-            positions=account_state.get('positions', []),
+            positions=positions,
             total_return_pct=account_state.get('total_return_pct', 0),
             sharpe_ratio=account_state.get('sharpe_ratio', 0),
             trade_history=account_state.get('trade_history', None),
             recent_decisions=account_state.get('recent_decisions', None),
         )
-        lines.append(account_section)
 
-        lines.append("---")
-        lines.append("")
-        lines.append("Based on this data, make your trading decision. Ensure all constraints are met. Return valid JSON only.")
+        # Trading Focus Instructions
+        max_positions = account_state.get('max_positions', 3)  # Default to 3 if not provided
 
-        return "\n".join(lines)
+        if positions:
+            w("!!! POSITION MANAGEMENT FOCUS !!!\n")
+            w(f"You currently have {len(positions)} of {max_positions} OPEN position(s):\n")
+            for pos in positions:
+                w(self._POS_FOCUS_TEMPLATE.format(
+                    coin=pos.coin,
+                    side=pos.side.upper(),
+                    entry_price=pos.entry_price,
+                    quantity_usd=pos.quantity_usd,
+                    leverage=pos.leverage,
+                    time_open=f" ({pos.time_open})" if pos.time_open else "",
+                ))
+            w("\n")
+
+            if len(positions) >= max_positions:
+                w(f"⚠️  POSITION LIMIT REACHED ({len(positions)}/{max_positions})\n")
+                w(
+                    "You CANNOT open new positions until you close an existing one.\n"
+                    "Your options:\n"
+                    "  1. HOLD one of your existing positions\n"
+                    "  2. CLOSE a position to free up a slot\n\n"
+                    "Do NOT choose buy_to_enter or sell_to_enter - you're at max capacity!\n"
+                )
+            else:
+                w(f"POSITION CAPACITY: {len(positions)}/{max_positions} slots used\n")
+                w(
+                    "Your options:\n"
+                    "  1. HOLD or CLOSE existing positions\n"
+                )
+                w(f"  2. Open NEW positions in different coins (you have {max_positions - len(positions)} slot(s) available)\n")
+                w(
+                    "\n"
+                    "Multiple positions across different coins is ALLOWED and ENCOURAGED for diversification.\n"
+                    "Don't close winning positions prematurely just to open a new one!\n"
+                )
+            w("\n")
+
+        # Supervisor Guidance (High Priority). Free-form text is kept out of
+        # the cacheable prefix; quotes are escaped and the text is clipped to
+        # a fixed size.
+        if user_guidance:
+            if len(user_guidance) > self.MAX_GUIDANCE_CHARS:
+                user_guidance = user_guidance[:self.MAX_GUIDANCE_CHARS] + "…"
+            user_guidance = user_guidance.replace('"', '\\"')
+            w(
+                "!!! SUPERVISOR GUIDANCE (HIGH PRIORITY) !!!\n"
+                "The human supervisor has provided the following context/instruction:\n"
+            )
+            w(f"> \"{user_guidance}\"\n")
+            w(
+                "You MUST consider this input in your analysis and decision making.\n"
+                "If this guidance contradicts standard rules, prioritize this guidance (within safety limits).\n\n"
+            )
+
+        # Session duration and per-coin leverage limits, right before the
+        # final instruction
+        w(f"Trading Session Duration: {minutes_since_start} minutes.\n")
+        if leverage_limits:
+            w("\nLEVERAGE LIMITS PER ASSET:\n")
+            for symbol, max_lev in leverage_limits.items():
+                w(_LEVERAGE_LIMIT_ROW.format(symbol, max_lev))
+        w("\n")
+
+        w(_SEP)
+        w("Based on this data, make your trading decision. Ensure all constraints are met. Return valid JSON only.")
+        blocks.append({"type": "text", "text": "".join(tail)})
+
+        return blocks
 
     def get_system_prompt(self) -> str:
-        return self._generate_system_prompt_template()
+        return self._system_prompt
+
+    def get_system_prompt_blocks(self) -> List[Dict[str, Any]]:
+        """
+        Get the system prompt as Anthropic content blocks.
+
+        The cache boundary sits on the static tail: the header only changes
+        with the config/preset, so the whole system prompt is a stable,
+        cacheable prefix across cycles. It uses the 1-hour cache TTL so it
+        survives long cycle intervals and pauses (the user-prompt
+        breakpoints keep the default 5 minutes; longer TTLs must come
+        first, which the system prompt always does). Joining the block
+        texts gives exactly `get_system_prompt()`.
+
+        Returns:
+            [header block, static tail block with cache_control]
+        """
+        return [
+            {"type": "text", "text": self._system_prompt_header},
+            {"type": "text", "text": _STATIC_SYSTEM_TAIL, "cache_control": {"type": "ephemeral", "ttl": "1h"}},
+        ]
+
+
+@lru_cache(maxsize=4)
+def get_prompt_builder(config: TradingConfig) -> PromptBuilder:
+    """
+    Get a PromptBuilder for a config, reusing the one built for an equal config.
+
+    The bot calls this every cycle; handing back the same builder keeps its
+    frame and account-section caches warm across cycles.
+    """
+    return PromptBuilder(config=config)
 
 
 # --------------------------------------------------------------------------
@@ -389,6 +1029,8 @@ IMPORTANT: Data provided below is ordered OLDEST → NEWEST."""
 # --------------------------------------------------------------------------
 
 if __name__ == "__main__":
+    import pandas as pd
+
     print("=" * 70)
     print("Dynamic Prompt Builder Test")
     print("=" * 70)
@@ -399,7 +1041,7 @@ if __name__ == "__main__":
         exchange_name="Hyperliquid",
         min_position_size_usd=10.0,  # User specified
         max_leverage=10.0,           # User specified
-        relevant_indicators=['ema_20', 'rsi_14', 'macd', 'volume']
+        relevant_indicators=('ema_20', 'rsi_14', 'macd', 'volume')
     )
 
     # 2. INSTANTIATE BUILDER
@@ -417,7 +1059,7 @@ if __name__ == "__main__":
     market_data = {
         'BTC-PERP': {
             'current_price': 50500.0,
-            'indicators': sample_data,
+            'indicators': {col: sample_data[col].values for col in sample_data},
             'funding_rate': 0.0001,
             'open_interest': 1000000.0
         }
@@ -10,9 +10,16 @@ Control via:
 - This script: python run_analysis_bot.py [start|stop|status]
 """
 
+import os
 import sys
 import time
+import json
+import hashlib
+import math
 import signal
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
 try:
@@ -22,30 +29,89 @@ except ImportError:
     from backports.zoneinfo import ZoneInfo
 
 from typing import Dict, Any
-import msvcrt  # Windows-specific key detection
+
+try:
+    import msvcrt  # Windows console key detection
+
+    def _kbhit() -> bool:
+        return msvcrt.kbhit()
+
+    def _getch() -> bytes:
+        return msvcrt.getch()
+
+    def _enable_key_input() -> bool:
+        """Windows consoles deliver single keys without setup."""
+        return True
+except ImportError:
+    # POSIX terminals: single keys from stdin in cbreak mode
+    import atexit
+    import select
+    import termios
+    import tty
+
+    def _kbhit() -> bool:
+        return bool(select.select([sys.stdin], [], [], 0)[0])
+
+    def _getch() -> bytes:
+        # b'' once stdin is closed
+        return os.read(sys.stdin.fileno(), 1)
+
+    def _enable_key_input() -> bool:
+        """Switch a terminal stdin to cbreak mode (no echo, no line
+        buffering; Ctrl+C still signals) until the process exits.
+
+        Returns False (keys are not read) unless the bot is the terminal's
+        foreground job: in a background job (``&``) changing or reading the
+        terminal raises SIGTTOU/SIGTTIN, which would stop the whole bot.
+        """
+        if not sys.stdin.isatty():
+            return False
+        fd = sys.stdin.fileno()
+        try:
+            if os.tcgetpgrp(fd) != os.getpgrp():
+                return False
+        except OSError:
+            return False
+        atexit.register(termios.tcsetattr, fd, termios.TCSADRAIN, termios.tcgetattr(fd))
+        tty.setcbreak(fd)
+        return True
+
+try:
+    # orjson is optional; it encodes the decision cache key faster
+    import orjson
+
+    def _sorted_json_bytes(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY, default=str)
+except ImportError:
+    def _sorted_json_bytes(obj) -> bytes:
+        return json.dumps(obj, sort_keys=True, default=str).encode()
 
 # Define Eastern Timezone
 EST_TIMEZONE = ZoneInfo("America/New_York")
 
 def flush_input():
     """Flush pending input from the buffer to prevent ghost commands."""
-    while msvcrt.kbhit():
-        msvcrt.getch()
+    while True:
+        try:
+            KEY_QUEUE.get_nowait()
+        except queue.Empty:
+            return
 
 sys.path.insert(0, str(Path(__file__).parent))
 
 from data.fetcher import MarketDataFetcher
 from data.indicators import TechnicalIndicators
 from llm.client import ClaudeClient
-from llm.prompts import PromptBuilder, TradingConfig
-from llm.parser import parse_llm_response
+from llm.prompts import TradingConfig, from_dataframe, get_prompt_builder
+from llm.parser import TradeSignal, parse_llm_response
 from trading.logger import TradingLogger
 from trading.account import TradingAccount
 from trading.executor import HyperliquidExecutor  # Live trading
 from config.settings import settings
 from web.database import (
-    get_closed_positions,
-    get_recent_decisions,
+    get_decision_and_position_context,
+    get_cached_decision,
+    save_cached_decision,
     set_database_path,
     save_account_state,
     update_decision_execution,
@@ -56,16 +122,65 @@ from web.database import (
     get_active_prompt_preset,
     get_bot_config
 )
+from web.bot_wake import PID_FILE, listen_for_wake, notify_bot
+
+# 3m candles fetched per coin. EMA-50 needs 50 bars before its first value
+# and the prompt renders the last 15, so 64 is the floor; the rest lets the
+# SMA-seeded EMAs converge (the seed's weight in the latest EMA-50 is ~57%
+# with 64 bars, ~13% with 100).
+# After the first cycle the fetcher only requests the newest bars anyway.
+OHLCV_HISTORY_BARS = 100
+
+# Indicator bars kept per coin for the prompt and market summary (indicators
+# are computed on the full fetch; the prompt renders the last 15 bars)
+PROMPT_HISTORY_BARS = 30
+
+# Reuse the LLM response for identical (rounded) inputs seen this recently;
+# see decision_cache_key for what counts as identical
+DECISION_CACHE_TTL_SECONDS = 600
+
+# Latest indicator values that go into the decision cache key
+DECISION_CACHE_INDICATORS = (
+    'ema_20', 'ema_50', 'rsi_7', 'rsi_14',
+    'macd', 'macd_signal', 'macd_hist', 'atr_3', 'atr_14',
+)
+
+# End-of-cycle writes handed to the IO worker thread (see submit_io)
+IO_QUEUE = queue.Queue()
+IO_WORKER = None
+
+# Keypresses read by the key reader thread (see start_key_reader)
+KEY_QUEUE = queue.Queue()
+KEY_READER = None
+
+# Lookups that don't depend on market data and run while OHLCV is fetched
+CYCLE_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cycle-prefetch")
+
+# Decision cache lookups this run (reported in the bot status)
+DECISION_CACHE_STATS = {'hits': 0, 'misses': 0}
 
 # Control file for start/stop
 CONTROL_FILE = Path(__file__).parent / "data" / "bot_control.txt"
 RUNNING = False
 
+# Set when the control state may have changed (see web.bot_wake), and by
+# the key reader so a keypress also wakes a waiting loop
+STATE_EVENT = threading.Event()
+
+# Seconds between control file checks while waiting or paused. Control
+# commands and the dashboard wake the bot when they write the file, so
+# this only catches other writers (e.g. editing the file by hand).
+CONTROL_POLL_SECONDS = 10.0
+
+# (st_mtime_ns, st_size) of the control file and the state last read from it
+_control_cache = (None, "stopped")
+
 # Global context for interactive queries
 LATEST_CONTEXT = {
     'executor': None,
     'account': None,
-    'is_live': False
+    'is_live': False,
+    'fetcher': None,
 }
 
 def print_live_status():
@@ -82,8 +197,6 @@ def print_live_status():
     if is_live and executor:
         try:
             # Re-use get_current_account_state which fetches live prices/positions
-            from data.fetcher import MarketDataFetcher
-            
             # We need current prices for the summary calculation
             # But get_current_account_state does a decent job for live mode 
             # by querying the exchange directly
@@ -110,18 +223,20 @@ def print_live_status():
         # Paper trading
         print("PAPER TRADING MODE")
         # For paper, we need to fetch current prices to show accurate PnL and check liquidations
-        fetcher = MarketDataFetcher()
+        # Reuse the bot's fetcher (and its exchange session) when running
+        fetcher = LATEST_CONTEXT.get('fetcher') or MarketDataFetcher()
         current_prices = {}
         
         if account.positions:
             print("\nFetching current prices & checking liquidations...")
-            for coin in account.positions:
-                try:
-                    df = fetcher.fetch_ohlcv(coin, limit=1)
+            # All open coins are fetched concurrently
+            try:
+                frames = fetcher.fetch_ohlcv_many(list(account.positions), limit=1)
+                for coin, df in frames.items():
                     if not df.empty:
-                        current_prices[coin] = df['close'].iloc[-1]
-                except:
-                    pass
+                        current_prices[coin] = df['close'].to_numpy()[-1]
+            except:
+                pass
             
             # Check for liquidations
             liquidated_ids = account.check_liquidation(current_prices)
@@ -149,20 +264,36 @@ def print_live_status():
 
 
 def read_control_state():
-    """Read the bot control state from file."""
-    if not CONTROL_FILE.exists():
+    """Read the bot control state from file (re-read only when it changed)."""
+    global _control_cache
+    try:
+        st = CONTROL_FILE.stat()
+    except OSError:
         return "stopped"
 
+    stamp = (st.st_mtime_ns, st.st_size)
+    if _control_cache[0] == stamp:
+        return _control_cache[1]
+
     try:
-        return CONTROL_FILE.read_text().strip()
+        state = CONTROL_FILE.read_text().strip()
     except:
         return "stopped"
+    _control_cache = (stamp, state)
+    return state
 
 
 def write_control_state(state):
     """Write the bot control state to file."""
+    global _control_cache
     CONTROL_FILE.parent.mkdir(parents=True, exist_ok=True)
     CONTROL_FILE.write_text(state)
+    # Prime the read cache so our own write isn't read back from disk
+    try:
+        st = CONTROL_FILE.stat()
+        _control_cache = ((st.st_mtime_ns, st.st_size), state.strip())
+    except OSError:
+        pass
 
 
 def signal_handler(sig, frame):
@@ -172,6 +303,131 @@ def signal_handler(sig, frame):
     sys.exit(0)
 
 
+def _io_worker(q):
+    """Run queued writes in submission order (daemon thread)."""
+    while True:
+        op = q.get()
+        try:
+            op()
+        except Exception as e:
+            print(f"\n[WARN] Background write failed: {e}", flush=True)
+        finally:
+            q.task_done()
+
+
+def start_io_worker():
+    """Start the IO worker thread (once)."""
+    global IO_WORKER
+    if IO_WORKER is None:
+        IO_WORKER = threading.Thread(target=_io_worker, args=(IO_QUEUE,), daemon=True)
+        IO_WORKER.start()
+
+
+def _key_reader(q):
+    """Queue keypresses as they arrive (daemon thread; getch blocks)."""
+    while True:
+        key = _getch()
+        if not key:
+            return  # stdin closed (not interactive)
+        q.put(key.lower())
+        STATE_EVENT.set()
+
+
+def start_key_reader():
+    """
+    Start the key reader thread (once). Without key input (not a console,
+    or a background job) the bot is controlled through the control file only.
+    """
+    global KEY_READER
+    if KEY_READER is None:
+        if not _enable_key_input():
+            return
+        # Drop keys typed before the reader starts
+        while _kbhit():
+            if not _getch():
+                break
+        KEY_READER = threading.Thread(target=_key_reader, args=(KEY_QUEUE,), daemon=True)
+        KEY_READER.start()
+
+
+def submit_io(op):
+    """Run `op` on the IO worker if it is running, otherwise inline."""
+    if IO_WORKER is None:
+        op()
+    else:
+        IO_QUEUE.put(op)
+
+
+def _price_bucket(price):
+    """Bucket a price in basis points of itself (log scale), so sub-$1 coins
+    and BTC are bucketed with the same relative precision."""
+    price = float(price)
+    if not price > 0.0:
+        return None
+    return round(math.log(price) * 10_000)
+
+
+def _significant(value, digits=4):
+    """Round to a number of significant digits (None for NaN)."""
+    value = float(value)
+    if value != value:
+        return None
+    return float(f"{value:.{digits}g}")
+
+
+def decision_cache_key(market_data, account_state, bot_config, user_guidance, preset_name, leverage_limits):
+    """
+    Hash the normalized inputs of a trading decision.
+
+    Prices are bucketed to basis points and the latest indicator values to
+    4 significant digits, so cycles on an unchanged market map to the same
+    key. The account goes in unrounded where it matters: cash, every open
+    position (entry price, size, leverage and PnL to the cent), the closed
+    trades and recent signals shown in the prompt, and the bot config. Any
+    fill or close since a response was cached therefore changes the key,
+    and that response is never replayed.
+    """
+    ind = {}
+    for coin, data in market_data.items():
+        arrays = data['indicators']
+        ind[coin] = {
+            'price_bucket': _price_bucket(data['current_price']),
+            **{
+                col: _significant(arrays[col][-1])
+                for col in DECISION_CACHE_INDICATORS if col in arrays
+            },
+        }
+
+    payload = {
+        'ind': ind,
+        'cash': round(float(account_state['available_cash']), 2),
+        'positions': sorted(
+            (p['coin'], p['side'], float(p['entry_price']), round(float(p['quantity_usd']), 2),
+             p['leverage'], round(float(p['unrealized_pnl']), 2))
+            for p in account_state['positions']
+        ),
+        'trades': [
+            (t.get('position_id'), t['coin'], t['side'], t['entry_price'],
+             t.get('exit_price'), t.get('exit_time'), t.get('realized_pnl'))
+            for t in account_state['trade_history']
+        ],
+        # Signals only: ids, timestamps and wording differ every cycle
+        'decisions': [
+            (d['coin'], d['signal'], d.get('entry_price'), d.get('exit_price'), d.get('realized_pnl'))
+            for d in account_state['recent_decisions']
+        ],
+        'max_positions': account_state['max_positions'],
+        'config': bot_config,
+        'guidance': user_guidance,
+        'preset': preset_name,
+        'leverage_limits': leverage_limits,
+    }
+    return hashlib.blake2b(
+        _sorted_json_bytes(payload),
+        digest_size=16,
+    ).hexdigest()
+
+
 def get_current_account_state(
     executor: HyperliquidExecutor = None,
     account: TradingAccount = None,
@@ -290,6 +546,237 @@ def get_current_account_state(
         return account.get_summary(current_prices or {})
 
 
+def _execute_entry(decision, coin, current_price, decision_id, account, executor, is_live):
+    """Open a long (buy_to_enter) or short (sell_to_enter) position."""
+    is_buy = decision.signal is TradeSignal.BUY_TO_ENTER
+
+    if is_live:
+        # LIVE TRADING
+        print(f"  [LIVE] Opening {'LONG' if is_buy else 'SHORT'} position", flush=True)
+        print(f"    Coin: {coin}", flush=True)
+        print(f"    Margin: ${decision.quantity_usd:.2f}", flush=True)
+        print(f"    Leverage: {decision.leverage}x", flush=True)
+        print(f"    Price: ${current_price:,.2f}", flush=True)
+
+        # Cap leverage for live trading (safety check)
+        # Hyperliquid max is typically 20x or 50x depending on coin, but definitely not 100x for most
+        safe_leverage = min(int(decision.leverage), 20)
+        if safe_leverage < int(decision.leverage):
+            print(f"    [WARN] Capping leverage from {decision.leverage}x to {safe_leverage}x for live safety", flush=True)
+
+        result = executor.market_open_usd(
+            coin=coin,
+            is_buy=is_buy,
+            usd_amount=decision.quantity_usd,
+            current_price=current_price,
+            leverage=safe_leverage,
+            slippage=0.05  # 5% slippage tolerance
+        )
+
+        if result and result.get("status") == "ok":
+            # Check if order was actually filled
+            filled = False
+            error_msg = None
+            fill_price = None
+            fill_size = None
+
+            for status in result.get("response", {}).get("data", {}).get("statuses", []):
+                if "filled" in status:
+                    filled_info = status["filled"]
+                    fill_price = float(filled_info.get('avgPx', current_price))
+                    fill_size = float(filled_info.get('totalSz', 0))
+                    print(f"  [SUCCESS] Order filled: {fill_size} @ ${fill_price}", flush=True)
+                    filled = True
+                elif "error" in status:
+                    error_msg = status["error"]
+                    print(f"  [FAILED] Order rejected: {error_msg}", flush=True)
+
+            # Log filled position to database
+            if filled and fill_price:
+                from datetime import datetime
+                from trading.logger import get_logger
+                trade_logger = get_logger()
+                position_id = f"{coin}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+                trade_logger.log_position_entry(
+                    position_id=position_id,
+                    coin=coin,
+                    side='long' if is_buy else 'short',
+                    entry_price=fill_price,
+                    quantity_usd=decision.quantity_usd,
+                    leverage=decision.leverage
+                )
+                print(f"  [DB] Position logged: {position_id}", flush=True)
+                # Update decision execution status to success
+                update_decision_execution(decision_id, 'success')
+            elif error_msg:
+                # Update decision execution status with error
+                update_decision_execution(decision_id, 'failed', error=error_msg)
+                # Also log to bot_status for visibility
+                from trading.logger import get_logger
+                get_logger().log_bot_status('error', f'Trade execution failed for {coin}', error=error_msg)
+
+            if not filled and not error_msg:
+                print(f"  [UNKNOWN] Order status unclear - check Hyperliquid", flush=True)
+                update_decision_execution(decision_id, 'failed', error='Order status unclear from Hyperliquid')
+        else:
+            print(f"  [FAILED] Live order failed - check logs", flush=True)
+            error_detail = result.get('error', 'Unknown API error') if result else 'No response from Hyperliquid'
+            update_decision_execution(decision_id, 'failed', error=error_detail)
+
+    else:
+        # PAPER TRADING
+        side = 'long' if is_buy else 'short'
+        if account.can_open_position(decision.quantity_usd, decision.leverage):
+            account.open_position(
+                coin=coin,
+                side=side,
+                entry_price=current_price,
+                quantity_usd=decision.quantity_usd,
+                leverage=decision.leverage,
+                decision_id=decision_id
+            )
+            print(f"  [PAPER] Opened {side} position", flush=True)
+            update_decision_execution(decision_id, 'success')
+        else:
+            # Error details already printed by can_open_position()
+            update_decision_execution(decision_id, 'skipped', error='Insufficient balance or risk limits exceeded')
+
+
+def _execute_close(decision, coin, current_price, decision_id, account, executor, is_live):
+    """Close the position in `coin`."""
+    if is_live:
+        # LIVE TRADING - Close position
+        print(f"  [LIVE] Closing {coin} position", flush=True)
+        result = executor.market_close(coin)
+        if result:
+            print(f"  [SUCCESS] Position closed!", flush=True)
+            update_decision_execution(decision_id, 'success')
+
+            # Log to database
+            # First check if we have this position tracked in DB
+            open_positions = get_open_positions()
+            db_position = next((p for p in open_positions if p['coin'] == coin), None)
+
+            if db_position:
+                # Calculate realized PnL
+                entry_price = db_position['entry_price']
+                quantity_usd = db_position['quantity_usd']
+                leverage = db_position['leverage']
+                side = db_position['side']
+
+                # Calculate actual quantity in coins (quantity_usd / entry_price)
+                quantity_coins = quantity_usd / entry_price
+
+                # Calculate PnL based on side
+                if side == 'long' or side == 'buy_to_enter':
+                    # Long: profit when price goes up
+                    price_change = current_price - entry_price
+                    realized_pnl = (price_change / entry_price) * quantity_usd * leverage
+                elif side == 'short' or side == 'sell_to_enter':
+                    # Short: profit when price goes down
+                    price_change = entry_price - current_price
+                    realized_pnl = (price_change / entry_price) * quantity_usd * leverage
+                else:
+                    # Unknown side, can't calculate properly
+                    realized_pnl = 0.0
+                    print(f"  [WARNING] Unknown position side '{side}', cannot calculate PnL accurately", flush=True)
+
+                # Close existing DB position
+                close_position(
+                    position_id=db_position['position_id'],
+                    exit_price=current_price,
+                    realized_pnl=realized_pnl
+                )
+                print(f"  [DB] Position closed: {db_position['position_id']} | Realized PnL: ${realized_pnl:.2f}", flush=True)
+            else:
+                # Position was opened externally or before bot started
+                # Try to get position data from Hyperliquid to calculate real PnL
+                from datetime import datetime
+                position_id = f"{coin}_EXT_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+                # Fetch position data from exchange
+                position_data = executor.get_position(coin)
+
+                if position_data:
+                    entry_price = position_data['entry_price']
+                    size = position_data['size']
+                    unrealized_pnl = position_data['unrealized_pnl']
+                    leverage_val = position_data.get('leverage', {}).get('value', decision.leverage)
+
+                    # Determine side from size (positive = long, negative = short)
+                    side = 'long' if size > 0 else 'short'
+
+                    # Use the unrealized PnL from exchange as realized PnL since we're closing
+                    realized_pnl = unrealized_pnl
+
+                    # Calculate quantity in USD
+                    quantity_usd = abs(size) * entry_price
+
+                    print(f"  [INFO] Retrieved external position data: entry=${entry_price:.2f}, size={size:.4f}, unrealized_pnl=${unrealized_pnl:.2f}", flush=True)
+                else:
+                    # Couldn't get position data, use placeholders
+                    entry_price = current_price
+                    side = 'unknown'
+                    quantity_usd = decision.quantity_usd
+                    leverage_val = decision.leverage
+                    realized_pnl = 0.0
+                    print(f"  [WARNING] Could not retrieve external position data, using placeholders", flush=True)
+
+                # Log the position entry
+                save_position_entry(
+                    position_id=position_id,
+                    coin=coin,
+                    side=side,
+                    entry_price=entry_price,
+                    quantity_usd=quantity_usd,
+                    leverage=leverage_val,
+                    decision_id=decision_id
+                )
+
+                # Close the position with calculated PnL
+                close_position(
+                    position_id=position_id,
+                    exit_price=current_price,
+                    realized_pnl=realized_pnl
+                )
+                print(f"  [DB] External position logged and closed: {position_id} | Realized PnL: ${realized_pnl:.2f}", flush=True)
+        else:
+            print(f"  [INFO] No position to close or close failed", flush=True)
+            update_decision_execution(decision_id, 'failed', error='No position to close or close operation failed')
+    else:
+        # PAPER TRADING
+        if coin in account.positions:
+            account.close_position(coin, exit_price=current_price)
+            print(f"  [PAPER] Position closed", flush=True)
+            update_decision_execution(decision_id, 'success')
+        else:
+            print(f"  [INFO] No position to close for {coin}", flush=True)
+            update_decision_execution(decision_id, 'skipped', error='No position to close')
+
+
+def _execute_hold(decision, coin, current_price, decision_id, account, executor, is_live):
+    """Take no action; report the open position's PnL if any."""
+    # Just hold - same for both modes
+    print(f"  [HOLD] No action taken", flush=True)
+    update_decision_execution(decision_id, 'success')  # Hold is always successful
+    if not is_live and coin in account.positions:
+        unrealized_pnl = account.positions[coin].calculate_pnl(current_price)
+        print(f"    Current position unrealized PnL: ${unrealized_pnl:+.2f}", flush=True)
+    elif is_live:
+        position_info = executor.get_position_info(coin)
+        if position_info:
+            print(f"    Current position unrealized PnL: ${position_info['unrealized_pnl']:+.2f}", flush=True)
+
+
+# Trade handler for each signal (see execute_trade)
+TRADE_HANDLERS = {
+    TradeSignal.BUY_TO_ENTER: _execute_entry,
+    TradeSignal.SELL_TO_ENTER: _execute_entry,
+    TradeSignal.CLOSE: _execute_close,
+    TradeSignal.HOLD: _execute_hold,
+}
+
+
 def execute_trade(
     decision,
     coin: str,
@@ -311,228 +798,21 @@ def execute_trade(
         executor: HyperliquidExecutor for live trading (required if live)
         is_live: True for live trading, False for paper trading
     """
-    signal = decision.signal.value
-
-    print(f"\n[EXECUTION] {'LIVE' if is_live else 'PAPER'} MODE: {signal.upper()}", flush=True)
+    sig = decision.signal
 
-    if signal == 'buy_to_enter' or signal == 'sell_to_enter':
-        is_buy = (signal == 'buy_to_enter')
+    print(f"\n[EXECUTION] {'LIVE' if is_live else 'PAPER'} MODE: {sig.value.upper()}", flush=True)
 
-        if is_live:
-            # LIVE TRADING
-            print(f"  [LIVE] Opening {'LONG' if is_buy else 'SHORT'} position", flush=True)
-            print(f"    Coin: {coin}", flush=True)
-            print(f"    Margin: ${decision.quantity_usd:.2f}", flush=True)
-            print(f"    Leverage: {decision.leverage}x", flush=True)
-            print(f"    Price: ${current_price:,.2f}", flush=True)
-
-            # Cap leverage for live trading (safety check)
-            # Hyperliquid max is typically 20x or 50x depending on coin, but definitely not 100x for most
-            safe_leverage = min(int(decision.leverage), 20)
-            if safe_leverage < int(decision.leverage):
-                print(f"    [WARN] Capping leverage from {decision.leverage}x to {safe_leverage}x for live safety", flush=True)
-
-            result = executor.market_open_usd(
-                coin=coin,
-                is_buy=is_buy,
-                usd_amount=decision.quantity_usd,
-                current_price=current_price,
-                leverage=safe_leverage,
-                slippage=0.05  # 5% slippage tolerance
-            )
-
-            if result and result.get("status") == "ok":
-                # Check if order was actually filled
-                filled = False
-                error_msg = None
-                fill_price = None
-                fill_size = None
-
-                for status in result.get("response", {}).get("data", {}).get("statuses", []):
-                    if "filled" in status:
-                        filled_info = status["filled"]
-                        fill_price = float(filled_info.get('avgPx', current_price))
-                        fill_size = float(filled_info.get('totalSz', 0))
-                        print(f"  [SUCCESS] Order filled: {fill_size} @ ${fill_price}", flush=True)
-                        filled = True
-                    elif "error" in status:
-                        error_msg = status["error"]
-                        print(f"  [FAILED] Order rejected: {error_msg}", flush=True)
-
-                # Log filled position to database
-                if filled and fill_price:
-                    from datetime import datetime
-                    from trading.logger import get_logger
-                    trade_logger = get_logger()
-                    position_id = f"{coin}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-                    trade_logger.log_position_entry(
-                        position_id=position_id,
-                        coin=coin,
-                        side='long' if is_buy else 'short',
-                        entry_price=fill_price,
-                        quantity_usd=decision.quantity_usd,
-                        leverage=decision.leverage
-                    )
-                    print(f"  [DB] Position logged: {position_id}", flush=True)
-                    # Update decision execution status to success
-                    update_decision_execution(decision_id, 'success')
-                elif error_msg:
-                    # Update decision execution status with error
-                    update_decision_execution(decision_id, 'failed', error=error_msg)
-                    # Also log to bot_status for visibility
-                    from trading.logger import get_logger
-                    get_logger().log_bot_status('error', f'Trade execution failed for {coin}', error=error_msg)
-
-                if not filled and not error_msg:
-                    print(f"  [UNKNOWN] Order status unclear - check Hyperliquid", flush=True)
-                    update_decision_execution(decision_id, 'failed', error='Order status unclear from Hyperliquid')
-            else:
-                print(f"  [FAILED] Live order failed - check logs", flush=True)
-                error_detail = result.get('error', 'Unknown API error') if result else 'No response from Hyperliquid'
-                update_decision_execution(decision_id, 'failed', error=error_detail)
+    TRADE_HANDLERS[sig](decision, coin, current_price, decision_id, account, executor, is_live)
 
-        else:
-            # PAPER TRADING
-            side = 'long' if is_buy else 'short'
-            if account.can_open_position(decision.quantity_usd, decision.leverage):
-                account.open_position(
-                    coin=coin,
-                    side=side,
-                    entry_price=current_price,
-                    quantity_usd=decision.quantity_usd,
-                    leverage=decision.leverage,
-                    decision_id=decision_id
-                )
-                print(f"  [PAPER] Opened {side} position", flush=True)
-                update_decision_execution(decision_id, 'success')
-            else:
-                # Error details already printed by can_open_position()
-                update_decision_execution(decision_id, 'skipped', error='Insufficient balance or risk limits exceeded')
 
-    elif signal == 'close':
-        if is_live:
-            # LIVE TRADING - Close position
-            print(f"  [LIVE] Closing {coin} position", flush=True)
-            result = executor.market_close(coin)
-            if result:
-                print(f"  [SUCCESS] Position closed!", flush=True)
-                update_decision_execution(decision_id, 'success')
-                
-                # Log to database
-                # First check if we have this position tracked in DB
-                open_positions = get_open_positions()
-                db_position = next((p for p in open_positions if p['coin'] == coin), None)
-                
-                if db_position:
-                    # Calculate realized PnL
-                    entry_price = db_position['entry_price']
-                    quantity_usd = db_position['quantity_usd']
-                    leverage = db_position['leverage']
-                    side = db_position['side']
-
-                    # Calculate actual quantity in coins (quantity_usd / entry_price)
-                    quantity_coins = quantity_usd / entry_price
-
-                    # Calculate PnL based on side
-                    if side == 'long' or side == 'buy_to_enter':
-                        # Long: profit when price goes up
-                        price_change = current_price - entry_price
-                        realized_pnl = (price_change / entry_price) * quantity_usd * leverage
-                    elif side == 'short' or side == 'sell_to_enter':
-                        # Short: profit when price goes down
-                        price_change = entry_price - current_price
-                        realized_pnl = (price_change / entry_price) * quantity_usd * leverage
-                    else:
-                        # Unknown side, can't calculate properly
-                        realized_pnl = 0.0
-                        print(f"  [WARNING] Unknown position side '{side}', cannot calculate PnL accurately", flush=True)
-
-                    # Close existing DB position
-                    close_position(
-                        position_id=db_position['position_id'],
-                        exit_price=current_price,
-                        realized_pnl=realized_pnl
-                    )
-                    print(f"  [DB] Position closed: {db_position['position_id']} | Realized PnL: ${realized_pnl:.2f}", flush=True)
-                else:
-                    # Position was opened externally or before bot started
-                    # Try to get position data from Hyperliquid to calculate real PnL
-                    from datetime import datetime
-                    position_id = f"{coin}_EXT_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-
-                    # Fetch position data from exchange
-                    position_data = executor.get_position(coin)
-
-                    if position_data:
-                        entry_price = position_data['entry_price']
-                        size = position_data['size']
-                        unrealized_pnl = position_data['unrealized_pnl']
-                        leverage_val = position_data.get('leverage', {}).get('value', decision.leverage)
-
-                        # Determine side from size (positive = long, negative = short)
-                        side = 'long' if size > 0 else 'short'
-
-                        # Use the unrealized PnL from exchange as realized PnL since we're closing
-                        realized_pnl = unrealized_pnl
-
-                        # Calculate quantity in USD
-                        quantity_usd = abs(size) * entry_price
-
-                        print(f"  [INFO] Retrieved external position data: entry=${entry_price:.2f}, size={size:.4f}, unrealized_pnl=${unrealized_pnl:.2f}", flush=True)
-                    else:
-                        # Couldn't get position data, use placeholders
-                        entry_price = current_price
-                        side = 'unknown'
-                        quantity_usd = decision.quantity_usd
-                        leverage_val = decision.leverage
-                        realized_pnl = 0.0
-                        print(f"  [WARNING] Could not retrieve external position data, using placeholders", flush=True)
-
-                    # Log the position entry
-                    save_position_entry(
-                        position_id=position_id,
-                        coin=coin,
-                        side=side,
-                        entry_price=entry_price,
-                        quantity_usd=quantity_usd,
-                        leverage=leverage_val,
-                        decision_id=decision_id
-                    )
-
-                    # Close the position with calculated PnL
-                    close_position(
-                        position_id=position_id,
-                        exit_price=current_price,
-                        realized_pnl=realized_pnl
-                    )
-                    print(f"  [DB] External position logged and closed: {position_id} | Realized PnL: ${realized_pnl:.2f}", flush=True)
-            else:
-                print(f"  [INFO] No position to close or close failed", flush=True)
-                update_decision_execution(decision_id, 'failed', error='No position to close or close operation failed')
-        else:
-            # PAPER TRADING
-            if coin in account.positions:
-                account.close_position(coin, exit_price=current_price)
-                print(f"  [PAPER] Position closed", flush=True)
-                update_decision_execution(decision_id, 'success')
-            else:
-                print(f"  [INFO] No position to close for {coin}", flush=True)
-                update_decision_execution(decision_id, 'skipped', error='No position to close')
-
-    elif signal == 'hold':
-        # Just hold - same for both modes
-        print(f"  [HOLD] No action taken", flush=True)
-        update_decision_execution(decision_id, 'success')  # Hold is always successful
-        if not is_live and coin in account.positions:
-            unrealized_pnl = account.positions[coin].calculate_pnl(current_price)
-            print(f"    Current position unrealized PnL: ${unrealized_pnl:+.2f}", flush=True)
-        elif is_live:
-            position_info = executor.get_position_info(coin)
-            if position_info:
-                print(f"    Current position unrealized PnL: ${position_info['unrealized_pnl']:+.2f}", flush=True)
-
-
-def run_analysis_cycle(account: TradingAccount, start_time: datetime, executor: HyperliquidExecutor = None):
+def run_analysis_cycle(
+    account: TradingAccount,
+    start_mono: float,
+    executor: HyperliquidExecutor = None,
+    fetcher: MarketDataFetcher = None,
+    client: ClaudeClient = None,
+    logger: TradingLogger = None,
+):
     """
     Run one analysis cycle:
     1. Fetch market data for all configured assets
@@ -543,22 +823,30 @@ def run_analysis_cycle(account: TradingAccount, start_time: datetime, executor:
 
     Args:
         account: TradingAccount instance to track balance and positions
-        start_time: Bot start time to calculate minutes since start
+        start_mono: Bot start time (time.monotonic()) to calculate minutes
+            since start, unaffected by wall clock adjustments
         executor: Optional HyperliquidExecutor for live trading
+        fetcher: MarketDataFetcher reused across cycles (created if None)
+        client: ClaudeClient reused across cycles (created if None)
+        logger: TradingLogger reused across cycles (created if None)
 
     Returns:
         bool: True if successful, False if error
     """
+    # Wall-clock time of this cycle, read once (header, candle age, session minutes)
+    cycle_now = datetime.now(EST_TIMEZONE)
+
     try:
         print("\n" + "="*70, flush=True)
         print("\n" + "="*70, flush=True)
-        print(f"ANALYSIS CYCLE - {datetime.now(EST_TIMEZONE).strftime('%Y-%m-%d %H:%M:%S')} ET", flush=True)
+        print(f"ANALYSIS CYCLE - {cycle_now.strftime('%Y-%m-%d %H:%M:%S')} ET", flush=True)
         print("="*70, flush=True)
 
-        # Initialize
-        fetcher = MarketDataFetcher()
-        client = ClaudeClient()
-        logger = TradingLogger()
+        # Initialize (run_bot passes long-lived instances so the exchange /
+        # Anthropic connection pools stay warm between cycles)
+        fetcher = fetcher or MarketDataFetcher()
+        client = client or ClaudeClient()
+        logger = logger or TradingLogger()
         
         # Load configuration
         bot_config = get_bot_config()
@@ -582,7 +870,8 @@ def run_analysis_cycle(account: TradingAccount, start_time: datetime, executor:
 
         # Get assets to actively analyze from settings
         # This respects ACTIVE_TRADING_ASSETS if set, otherwise uses all TRADING_ASSETS
-        coins_to_analyze = list(settings.get_active_trading_assets())
+        # (parsed once per distinct string; the returned list is ours to extend)
+        coins_to_analyze = settings.get_active_trading_assets()
 
         # Add any coins with open positions that aren't in the active list
         # (We always need to analyze coins we have positions in)
@@ -599,25 +888,43 @@ def run_analysis_cycle(account: TradingAccount, start_time: datetime, executor:
         market_data = {}
         current_prices = {}
 
+        # Requests for all coins run concurrently; results are reported in order
+        # Meanwhile, read the prompt's trade history/decisions and (live mode,
+        # where the account state doesn't depend on our prices) refresh the
+        # account from the exchange
+        context_future = CYCLE_POOL.submit(
+            get_decision_and_position_context, pos_limit=10, dec_limit=5
+        )
+        live_state_future = None
+        if is_live:
+            live_state_future = CYCLE_POOL.submit(
+                get_current_account_state,
+                executor=executor, account=account, current_prices={}, is_live=True
+            )
+
+        ohlcv_by_coin = fetcher.fetch_ohlcv_many(coins_to_analyze, timeframe='3m', limit=OHLCV_HISTORY_BARS)
+
+        # The fetches are done by now, so per-coin lines are left to the
+        # next flush instead of forcing a write each
         for coin in coins_to_analyze:
-            print(f"  Fetching {coin}...", flush=True)
-            ohlcv = fetcher.fetch_ohlcv(coin, timeframe='3m', limit=100)
+            print(f"  Fetching {coin}...")
+            ohlcv = ohlcv_by_coin[coin]
 
             if ohlcv.empty:
-                print(f"    [WARN] Could not fetch data for {coin}", flush=True)
+                print(f"    [WARN] Could not fetch data for {coin}")
                 continue
 
-            current_price = ohlcv['close'].iloc[-1]
+            current_price = ohlcv['close'].to_numpy()[-1]
             current_prices[coin] = current_price
-            print(f"    [OK] Current price: ${current_price:,.2f}", flush=True)
+            print(f"    [OK] Current price: ${current_price:,.2f}")
 
-            # Calculate indicators
+            # Calculate indicators on the full history, keep only the recent
+            # tail as column -> array (the form the prompt builder renders)
             data_with_indicators = TechnicalIndicators.calculate_all(ohlcv)
 
             market_data[coin] = {
                 'current_price': current_price,
-                'ohlcv': data_with_indicators,
-                'indicators': data_with_indicators,
+                'indicators': from_dataframe(data_with_indicators, window=PROMPT_HISTORY_BARS),
                 'funding_rate': 0.0001,
                 'open_interest': None,
             }
@@ -630,18 +937,23 @@ def run_analysis_cycle(account: TradingAccount, start_time: datetime, executor:
         print(f"\n[3/4] Market summary...", flush=True)
         primary_coin = coins_to_analyze[0]
         if primary_coin in market_data:
-            latest = market_data[primary_coin]['indicators'].iloc[-1]
+            # Latest indicator values as plain scalars, unpacked once
+            indicators = market_data[primary_coin]['indicators']
+            ema_20, ema_50, rsi_7, rsi_14, macd, macd_signal, macd_hist = (
+                indicators[col][-1] if col in indicators else 0
+                for col in ('ema_20', 'ema_50', 'rsi_7', 'rsi_14', 'macd', 'macd_signal', 'macd_hist')
+            )
             current_price = market_data[primary_coin]['current_price']
 
             # Get latest candle timestamp and convert to aware EST
             # OHLCV timestamps from ccxt/pandas are typically naive UTC (or just naive)
             # We treat them as UTC and convert to EST
-            latest_candle_time = market_data[primary_coin]['ohlcv']['timestamp'].iloc[-1]
+            latest_candle_time = indicators['timestamp'][-1].astype('datetime64[us]').item()
             if latest_candle_time.tzinfo is None:
                 latest_candle_time = latest_candle_time.replace(tzinfo=timezone.utc)
             
             latest_candle_time_est = latest_candle_time.astimezone(EST_TIMEZONE)
-            current_time_est = datetime.now(EST_TIMEZONE)
+            current_time_est = cycle_now
             
             candle_age_seconds = (current_time_est - latest_candle_time_est).total_seconds()
 
@@ -649,54 +961,70 @@ def run_analysis_cycle(account: TradingAccount, start_time: datetime, executor:
             candle_timeframe_seconds = 3 * 60  # 3 minutes
             cycle_interval = bot_config['execution_interval_seconds']
 
-            print(f"\n" + "="*70, flush=True)
-            print(f"MARKET DATA SUMMARY - {primary_coin}", flush=True)
-            print("="*70, flush=True)
-            print(f"Current Price:    ${current_price:,.2f}", flush=True)
-            print(f"Latest Candle:    {latest_candle_time_est.strftime('%Y-%m-%d %H:%M:%S')} ET ({candle_age_seconds:.0f}s ago)", flush=True)
+            # The block is assembled first and written with a single flush
+            # rather than ~20 separately flushed prints
+            summary = [
+                "",
+                "="*70,
+                f"MARKET DATA SUMMARY - {primary_coin}",
+                "="*70,
+                f"Current Price:    ${current_price:,.2f}",
+                f"Latest Candle:    {latest_candle_time_est.strftime('%Y-%m-%d %H:%M:%S')} ET ({candle_age_seconds:.0f}s ago)",
+            ]
 
             # Warning if cycle is faster than candle timeframe
             if cycle_interval < candle_timeframe_seconds:
-                print(f"", flush=True)
-                print(f"⚠️  WARNING: Cycle interval ({cycle_interval}s) < Candle timeframe ({candle_timeframe_seconds}s)", flush=True)
-                print(f"   Bot may see the SAME candle data on consecutive cycles!", flush=True)
-                print(f"   Recommended: Set cycle interval >= 180s (3 minutes) in Settings", flush=True)
-
-            print(f"", flush=True)
-            print(f"Technical Indicators (3-minute timeframe):", flush=True)
-            print(f"  EMA-20:         ${latest.get('ema_20', 0):,.2f}", flush=True)
-            print(f"  EMA-50:         ${latest.get('ema_50', 0):,.2f}", flush=True)
-            print(f"  RSI-7:          {latest.get('rsi_7', 0):.2f}", flush=True)
-            print(f"  RSI-14:         {latest.get('rsi_14', 0):.2f}", flush=True)
-            print(f"  MACD:           {latest.get('macd', 0):.2f}", flush=True)
-            print(f"  MACD Signal:    {latest.get('macd_signal', 0):.2f}", flush=True)
-            print(f"  MACD Histogram: {latest.get('macd_hist', 0):.2f}", flush=True)
+                summary += [
+                    "",
+                    f"⚠️  WARNING: Cycle interval ({cycle_interval}s) < Candle timeframe ({candle_timeframe_seconds}s)",
+                    f"   Bot may see the SAME candle data on consecutive cycles!",
+                    f"   Recommended: Set cycle interval >= 180s (3 minutes) in Settings",
+                ]
+
+            summary += [
+                "",
+                f"Technical Indicators (3-minute timeframe):",
+                f"  EMA-20:         ${ema_20:,.2f}",
+                f"  EMA-50:         ${ema_50:,.2f}",
+                f"  RSI-7:          {rsi_7:.2f}",
+                f"  RSI-14:         {rsi_14:.2f}",
+                f"  MACD:           {macd:.2f}",
+                f"  MACD Signal:    {macd_signal:.2f}",
+                f"  MACD Histogram: {macd_hist:.2f}",
+            ]
 
             # Show price trend
-            indicators_df = market_data[primary_coin]['indicators']
-            if len(indicators_df) >= 2:
-                prev_price = indicators_df['close'].iloc[-2]
+            if len(indicators['close']) >= 2:
+                prev_price = indicators['close'][-2]
                 price_change = current_price - prev_price
                 price_change_pct = (price_change / prev_price) * 100
                 trend_symbol = "UP" if price_change > 0 else "DOWN" if price_change < 0 else "FLAT"
-                print(f"", flush=True)
-                print(f"Recent Movement:  {trend_symbol} ${price_change:+.2f} ({price_change_pct:+.2f}%)", flush=True)
+                summary += [
+                    "",
+                    f"Recent Movement:  {trend_symbol} ${price_change:+.2f} ({price_change_pct:+.2f}%)",
+                ]
 
-            print("="*70, flush=True)
+            summary.append("="*70)
+            print("\n".join(summary), flush=True)
 
         # Refresh account state with current prices
-        account_summary = get_current_account_state(
-            executor=executor,
-            account=account,
-            current_prices=current_prices,
-            is_live=is_live
-        )
+        if live_state_future is not None:
+            account_summary = live_state_future.result()
+        else:
+            account_summary = get_current_account_state(
+                executor=executor,
+                account=account,
+                current_prices=current_prices,
+                is_live=is_live
+            )
         
         # Check liquidations for paper trading
         if not is_live and account and current_prices:
              liquidations = account.check_liquidation(current_prices)
              if liquidations:
                  print(f"\n[LIQUIDATION] {len(liquidations)} positions liquidated!", flush=True)
+                 # The prefetched trade history predates these closes
+                 context_future = None
                  # Refresh summary again after liquidations
                  account_summary = get_current_account_state(
                     executor=executor,
@@ -732,11 +1060,14 @@ def run_analysis_cycle(account: TradingAccount, start_time: datetime, executor:
             logger.log_bot_status('paused', f'Insufficient balance: ${account_summary["balance"]:.2f}')
             return True  # Cycle complete, just can't trade
 
-        # Get trade history for context (last 10 closed positions)
-        trade_history = get_closed_positions(limit=10)
-
-        # Get recent decisions for context (last 5 decisions)
-        recent_decisions = get_recent_decisions(limit=5)
+        # Trade history (last 10 closed positions) and recent decisions
+        # (last 5) for context, read together in one query round-trip
+        if context_future is not None:
+            trade_history, recent_decisions = context_future.result()
+        else:
+            trade_history, recent_decisions = get_decision_and_position_context(
+                pos_limit=10, dec_limit=5
+            )
 
         account_state = {
             'available_cash': account_summary['balance'],
@@ -750,20 +1081,21 @@ def run_analysis_cycle(account: TradingAccount, start_time: datetime, executor:
         }
 
         # Calculate minutes since bot started
-        minutes_since_start = int((datetime.now(EST_TIMEZONE) - start_time).total_seconds() / 60)
+        minutes_since_start = int((time.monotonic() - start_mono) // 60)
 
         # Get active prompt preset from database
         active_preset = get_active_prompt_preset()
         print(f"[STRATEGY] Using prompt preset: {active_preset}", flush=True)
 
-        # Create PromptBuilder with configuration from database
+        # Get the PromptBuilder for the configuration from database (reused
+        # across cycles while the configuration is unchanged)
         trading_config = TradingConfig(
             exchange_name=settings.exchange_name if hasattr(settings, 'exchange_name') else "Hyperliquid",
             min_position_size_usd=bot_config['min_margin_usd'],  # This is margin (collateral), not notional
             max_leverage=settings.max_leverage if hasattr(settings, 'max_leverage') else 10.0,
             preset_name=active_preset,
         )
-        prompt_builder = PromptBuilder(config=trading_config)
+        prompt_builder = get_prompt_builder(trading_config)
         
         # Get active user guidance
         active_input = get_active_user_input()
@@ -786,24 +1118,47 @@ def run_analysis_cycle(account: TradingAccount, start_time: datetime, executor:
              for symbol in market_data.keys():
                  leverage_limits[symbol] = 100
 
-        system_prompt = prompt_builder.get_system_prompt()
-        user_prompt = prompt_builder.build_trading_prompt(
+        # Content blocks carry prompt-caching breakpoints; the joined text is
+        # what gets logged alongside the decision.
+        system_blocks = prompt_builder.get_system_prompt_blocks()
+        system_prompt = prompt_builder.get_system_prompt()  # cached; equals the joined blocks
+        user_blocks = prompt_builder.build_trading_prompt_blocks(
             market_data,
             account_state,
             minutes_since_start,
             user_guidance=user_guidance,
             leverage_limits=leverage_limits if leverage_limits else None
         )
+        user_prompt = "".join(block["text"] for block in user_blocks)
 
         # Get Claude's decision
         print(f"\n[4/4] Getting Claude's analysis...", flush=True)
         print(f"  (This may take 10-30 seconds...)", flush=True)
 
-        response = client.get_trading_decision(system_prompt, user_prompt)
+        # Identical inputs within the TTL reuse the cached response
+        cache_key = decision_cache_key(
+            market_data, account_state, bot_config,
+            user_guidance, active_preset, leverage_limits
+        )
+        response = get_cached_decision(cache_key, DECISION_CACHE_TTL_SECONDS)
+        cache_hit = response is not None
 
-        if not response:
-            print("  [FAIL] No response from Claude", flush=True)
-            return False
+        if cache_hit:
+            DECISION_CACHE_STATS['hits'] += 1
+            print("  [CACHE] Inputs unchanged - reusing recent decision", flush=True)
+        else:
+            DECISION_CACHE_STATS['misses'] += 1
+            # Stop reading the response early if the bot is stopped meanwhile
+            response = client.get_trading_decision(
+                system_blocks, user_blocks,
+                should_abort=lambda: read_control_state() == "stopped",
+            )
+
+            if not response:
+                print("  [FAIL] No response from Claude", flush=True)
+                return False
+
+            save_cached_decision(cache_key, response, DECISION_CACHE_TTL_SECONDS)
 
         # Parse decision (with leverage validation)
         decision = parse_llm_response(response, leverage_limits=leverage_limits)
@@ -821,7 +1176,7 @@ def run_analysis_cycle(account: TradingAccount, start_time: datetime, executor:
             return False
 
         # For hold decisions, populate with current position details if available
-        if decision.signal.value == 'hold':
+        if decision.signal is TradeSignal.HOLD:
             # In live mode, get position from account_summary; in paper mode, from account object
             if is_live and account_summary['positions']:
                 # Find the matching position from live Hyperliquid data
@@ -845,9 +1200,8 @@ def run_analysis_cycle(account: TradingAccount, start_time: datetime, executor:
             user_prompt=user_prompt
         )
 
-        # Execute decision (paper or live mode)
-        is_live = settings.is_live_trading() and executor is not None
-
+        # Execute decision (paper or live mode, as decided at the top of
+        # the cycle so the whole cycle runs in one mode)
         execute_trade(
             decision=decision,
             coin=decision_coin,
@@ -858,23 +1212,43 @@ def run_analysis_cycle(account: TradingAccount, start_time: datetime, executor:
             is_live=is_live
         )
 
-        # Save updated account state to database (for dashboard) and Motherhaven
-        if not is_live:
-            # Paper mode: use TradingAccount's save_state
-            account.save_state(current_prices)
-        else:
-            # Live mode: save real Hyperliquid state to database AND Motherhaven
-            logger.log_account_state(
-                balance=account_summary['balance'],
-                equity=account_summary['equity'],
-                unrealized_pnl=account_summary['unrealized_pnl'],
-                realized_pnl=account_summary['realized_pnl'],
-                sharpe_ratio=None,
-                num_positions=account_summary['num_positions']
-            )
-
         # Log bot status (without trades_today for now - will add to logger later)
-        logger.log_bot_status('running', f'Executed {decision.signal.value} for {decision_coin}')
+        status_message = f'Executed {decision.signal.value} for {decision_coin}'
+        if cache_hit:
+            status_message += " (decision cache hit)"
+        elif client.last_usage:
+            status_message += f" (prompt cache: {client.last_usage['cache_read_input_tokens']} tokens read)"
+        status_message += (
+            f" [decision cache {DECISION_CACHE_STATS['hits']} hits"
+            f" / {DECISION_CACHE_STATS['misses']} misses]"
+        )
+
+        # The paper account is read here, on the main thread: the key
+        # handler's status display can close liquidated positions while the
+        # IO worker is writing
+        account_snapshot = account.snapshot_state(current_prices) if not is_live else None
+
+        def write_cycle_records():
+            # End-of-cycle records are committed together (one SQLite commit)
+            with logger.batch():
+                # Save updated account state to database (for dashboard) and Motherhaven
+                if not is_live:
+                    # Paper mode: use TradingAccount's save_state
+                    account.save_state(snapshot=account_snapshot)
+                else:
+                    # Live mode: save real Hyperliquid state to database AND Motherhaven
+                    logger.log_account_state(
+                        balance=account_summary['balance'],
+                        equity=account_summary['equity'],
+                        unrealized_pnl=account_summary['unrealized_pnl'],
+                        realized_pnl=account_summary['realized_pnl'],
+                        sharpe_ratio=None,
+                        num_positions=account_summary['num_positions']
+                    )
+                logger.log_bot_status('running', status_message)
+
+        # Written by the IO worker so the wait for the next cycle starts now
+        submit_io(write_cycle_records)
 
         # Display decision
         print("\n" + "-"*70, flush=True)
@@ -909,12 +1283,15 @@ def run_bot():
     global RUNNING
     global LATEST_CONTEXT
 
+    # Trading mode is fixed for the life of the process
+    live_mode = settings.is_live_trading()
+
     print("="*70, flush=True)
-    mode = "LIVE TRADING" if settings.is_live_trading() else "PAPER TRADING"
+    mode = "LIVE TRADING" if live_mode else "PAPER TRADING"
     print(f"MOTHERBOT - {mode} BOT", flush=True)
     print("="*70, flush=True)
 
-    if settings.is_live_trading():
+    if live_mode:
         print("\n[!!!] LIVE TRADING MODE - REAL MONEY AT RISK [!!!]", flush=True)
         print(f"Testnet: {settings.hyperliquid_testnet}", flush=True)
     else:
@@ -927,7 +1304,7 @@ def run_bot():
     print("  - [q]uit or Ctrl+C: Stop the bot", flush=True)
     
     # Set database path based on mode (separate DBs for paper vs live)
-    db_mode = "live" if settings.is_live_trading() else "paper"
+    db_mode = "live" if live_mode else "paper"
     set_database_path(db_mode)
     print(f"  - Database: trading_bot_{db_mode}.db", flush=True)
     print("="*70, flush=True)
@@ -938,7 +1315,7 @@ def run_bot():
     executor = None
     account = None
 
-    if settings.is_live_trading():
+    if live_mode:
         # LIVE MODE: Initialize Hyperliquid executor
         print("\nInitializing Hyperliquid executor...", flush=True)
         try:
@@ -984,10 +1361,26 @@ def run_bot():
         LATEST_CONTEXT['account'] = account
         LATEST_CONTEXT['is_live'] = False
         
+    # Clients shared by every cycle (constructed once, not per cycle)
+    try:
+        fetcher = MarketDataFetcher()
+        client = ClaudeClient()
+        trade_logger = TradingLogger()
+    except Exception as e:
+        print(f"[ERROR] Failed to initialize clients: {e}", flush=True)
+        return
+    LATEST_CONTEXT['fetcher'] = fetcher
+
     print("="*70, flush=True)
 
-    # Set up signal handler
+    # Set up signal handlers
     signal.signal(signal.SIGINT, signal_handler)
+    if not listen_for_wake(STATE_EVENT.set):
+        print(f"[WARN] Control wakeups unavailable - checking the control file every {CONTROL_POLL_SECONDS:.0f}s", flush=True)
+    PID_FILE.parent.mkdir(parents=True, exist_ok=True)
+    PID_FILE.write_text(str(os.getpid()))
+    start_io_worker()
+    start_key_reader()
 
     # Mark as running
     write_control_state("running")
@@ -995,6 +1388,7 @@ def run_bot():
 
     # Track bot start time
     start_time = datetime.now(EST_TIMEZONE)
+    start_mono = time.monotonic()
     print(f"Bot started at: {start_time.strftime('%Y-%m-%d %H:%M:%S')} ET", flush=True)
 
     cycle_count = 0
@@ -1010,7 +1404,8 @@ def run_bot():
 
                 # Wait until resumed
                 while read_control_state() == "paused":
-                    time.sleep(5)
+                    STATE_EVENT.wait(CONTROL_POLL_SECONDS)
+                    STATE_EVENT.clear()
 
                 print("[!] Bot resumed!", flush=True)
                 continue
@@ -1020,7 +1415,10 @@ def run_bot():
             print(f"\n{'='*70}", flush=True)
             print(f"CYCLE #{cycle_count}", flush=True)
 
-            success = run_analysis_cycle(account, start_time, executor)
+            success = run_analysis_cycle(
+                account, start_mono, executor,
+                fetcher=fetcher, client=client, logger=trade_logger
+            )
 
             if success:
                 print(f"\n[OK] Cycle #{cycle_count} complete", flush=True)
@@ -1030,16 +1428,19 @@ def run_bot():
             # Wait before next cycle (configurable from Settings tab)
             bot_config = get_bot_config()
             wait_time = bot_config['execution_interval_seconds']
+            # Remaining time is measured on the monotonic clock; the wall
+            # clock is only read once, for display and the dashboard
+            deadline = time.monotonic() + wait_time
             next_cycle_time = datetime.now(EST_TIMEZONE) + timedelta(seconds=wait_time)
 
             # Save next cycle time for web dashboard countdown
             from web.database import set_bot_setting
             set_bot_setting('next_cycle_time', next_cycle_time.isoformat())
 
-            # Sleep with key check
-            # Check every 0.1s
-            check_interval = 0.1
-            steps = int(wait_time / check_interval)
+            # Sleep until the next countdown line, control file poll or the
+            # deadline; keypresses and control wakeups set STATE_EVENT to wake early
+            next_countdown = wait_time - 30
+            next_poll = 0.0
 
             # Flush any accidental keystrokes before waiting
             flush_input()
@@ -1048,24 +1449,35 @@ def run_bot():
             print(f"    Next cycle at: {next_cycle_time.strftime('%H:%M:%S')}", flush=True)
             print(f"    Commands: [p]rice check, [q]uit", flush=True)
 
-            for i in range(steps):
-                # Check for keypress
-                if msvcrt.kbhit():
-                    key = msvcrt.getch().lower()
+            while True:
+                now = time.monotonic()
+                remaining = deadline - now
+                if remaining <= 0:
+                    break
+
+                # Cleared before draining the keys so a keypress queued
+                # after the drain still wakes the next wait
+                woken = STATE_EVENT.is_set()
+                STATE_EVENT.clear()
+
+                # Handle keypresses
+                while not KEY_QUEUE.empty():
+                    key = KEY_QUEUE.get_nowait()
                     if key == b'p':
                         print_live_status()
                     elif key == b'q':
                         print("\n[USER] Quit command received", flush=True)
                         raise KeyboardInterrupt
-                
+
                 # Update countdown display every 30 seconds
-                current_time = i * check_interval
-                if i > 0 and int(current_time) % 30 == 0 and abs(current_time - round(current_time)) < 0.01:
-                     remaining = wait_time - int(current_time)
-                     print(f"    [{remaining}s remaining...]", flush=True)
-                
-                # Check control file every 1 second
-                if i % 10 == 0:
+                if remaining <= next_countdown:
+                    print(f"    [{next_countdown}s remaining...]", flush=True)
+                    while next_countdown >= remaining:
+                        next_countdown -= 30
+
+                # Check control file when signalled (or periodically as a fallback)
+                if woken or now >= next_poll:
+                    next_poll = now + CONTROL_POLL_SECONDS
                     try:
                         state = read_control_state()
                         if state != "running":
@@ -1073,13 +1485,17 @@ def run_bot():
                             break
                     except:
                         pass
-                
-                time.sleep(check_interval)
-                
+
+                wake_at = min(deadline, deadline - next_countdown, next_poll)
+                STATE_EVENT.wait(max(0.0, wake_at - time.monotonic()))
+
     except KeyboardInterrupt:
         print("\n\n[!] Bot stopped by user", flush=True)
     finally:
+        # Let queued end-of-cycle writes finish before exiting
+        IO_QUEUE.join()
         write_control_state("stopped")
+        PID_FILE.unlink(missing_ok=True)
         print("\n[*] Bot stopped", flush=True)
 
 
@@ -1112,16 +1528,19 @@ def main():
         elif command == "stop":
             print("Stopping bot...", flush=True)
             write_control_state("stopped")
+            notify_bot()
             print("Bot stopped", flush=True)
 
         elif command == "pause":
             print("Pausing bot...", flush=True)
             write_control_state("paused")
+            notify_bot()
             print("Bot paused", flush=True)
 
         elif command == "resume":
             print("Resuming bot...", flush=True)
             write_control_state("running")
+            notify_bot()
             print("Bot resumed", flush=True)
 
         elif command == "status":
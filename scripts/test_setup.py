@@ -44,13 +44,6 @@ except ImportError as e:
     print(f"  [FAIL] ccxt import failed: {e}")
     sys.exit(1)
 
-try:
-    import pandas_ta
-    print(f"  [OK] pandas_ta")
-except ImportError as e:
-    print(f"  [FAIL] pandas_ta import failed: {e}")
-    sys.exit(1)
-
 print()
 
 # Test LLM dependencies
@@ -0,0 +1,195 @@
+"""
+Parity tests for the indicator kernels in data.indicators.
+
+Reference values were produced by pandas_ta 0.4.71b0 (ema/rma with
+presma seeding, rsi over rma, macd with the signal EMA started at the
+first valid MACD value, sma via nb_sma, atr as an SMA-seeded rma of the
+true range) on the deterministic series below.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.indicators import TechnicalIndicators, _atr, _ema, _macd, _rsi, _sma
+
+
+RTOL = 1e-12
+
+_i = np.arange(40, dtype=np.float64)
+CLOSE = 100 + 5 * np.sin(0.7 * _i) + 0.3 * _i + 2 * np.cos(1.3 * _i)
+HIGH = CLOSE + 1 + 0.5 * np.abs(np.sin(_i))
+LOW = CLOSE - 1 - 0.5 * np.abs(np.cos(_i))
+
+# Same series with a missing bar in the middle
+CLOSE_GAP = CLOSE.copy()
+CLOSE_GAP[15] = np.nan
+
+
+def assert_reference(values, first_valid, expected):
+    """Check the NaN warm-up length and the values at the given indices."""
+    assert np.isnan(values[:first_valid]).all()
+    assert not np.isnan(values[first_valid])
+    for index, value in expected.items():
+        if np.isnan(value):
+            assert np.isnan(values[index]), index
+        else:
+            assert values[index] == pytest.approx(value, rel=RTOL), index
+
+
+def test_ema_matches_pandas_ta():
+    assert_reference(_ema(CLOSE, 10), 9, {
+        9: 101.41882588550614,
+        10: 102.63355328023127,
+        11: 103.59410946498659,
+        25: 105.4672412942527,
+        39: 111.97785551557541,
+    })
+
+
+def test_rsi_matches_pandas_ta():
+    assert_reference(_rsi(CLOSE, 14), 1, {
+        1: 100.0,
+        2: 99.10048442287868,
+        14: 69.88360856153518,
+        25: 56.00205031634336,
+        39: 67.81515585252733,
+    })
+    assert_reference(_rsi(CLOSE, 7), 1, {
+        1: 100.0,
+        7: 43.32664779666937,
+        39: 75.008790795904,
+    })
+
+
+def test_macd_matches_pandas_ta():
+    macd, signal, hist = _macd(CLOSE, 12, 26, 9)
+    assert_reference(macd, 25, {
+        25: 1.3254714913863097,
+        26: 1.070481114739124,
+        33: 1.6923891013890682,
+        39: 2.6993458637350614,
+    })
+    assert_reference(signal, 33, {
+        33: 1.7743529292232425,
+        34: 1.7210525961660366,
+        39: 1.9408664619588092,
+    })
+    assert_reference(hist, 33, {
+        33: -0.08196382783417433,
+        39: 0.7584794017762522,
+    })
+
+
+def test_sma_matches_pandas_ta():
+    assert_reference(_sma(CLOSE, 10), 9, {
+        9: 101.41882588550614,
+        10: 102.02880854115557,
+        25: 105.65384730920664,
+        39: 110.82154414043626,
+    })
+
+
+def test_short_input_is_all_nan():
+    short = CLOSE[:5]
+    assert np.isnan(_ema(short, 10)).all()
+    assert np.isnan(_sma(short, 10)).all()
+    for line in _macd(CLOSE[:20], 12, 26, 9):
+        assert np.isnan(line).all()
+    assert len(_ema(short[:0], 10)) == 0
+    assert np.isnan(_rsi(short[:1], 14)).all()
+
+
+def test_short_input_returns_none():
+    df = pd.DataFrame({"close": CLOSE[:14]})
+    assert TechnicalIndicators.calculate_ema(df, period=20) is None
+    assert TechnicalIndicators.calculate_rsi(df, period=14) is None
+    assert TechnicalIndicators.calculate_macd(df) is None
+
+
+def test_ema_carries_over_missing_bar():
+    assert_reference(_ema(CLOSE_GAP, 10), 9, {
+        14: 104.11231507169771,
+        15: 104.11231507169771,
+        16: 103.05516373071859,
+        20: 105.85242513798639,
+        39: 111.97986097655189,
+    })
+
+
+def test_ema_seed_skips_missing_bar():
+    close = CLOSE.copy()
+    close[3] = np.nan
+    assert _ema(close, 10)[9] == pytest.approx(np.nanmean(close[:10]), rel=RTOL)
+
+
+def test_rsi_carries_over_missing_bar():
+    assert_reference(_rsi(CLOSE_GAP, 14), 1, {
+        14: 69.88360856153518,
+        15: 69.88360856153518,
+        16: 69.88360856153518,
+        17: 70.9749341463156,
+        18: 75.9561979659934,
+        39: 69.71037111322046,
+    })
+
+
+def test_rsi_flat_series_is_nan():
+    assert np.isnan(_rsi(np.full(20, 100.0), 14)[1:]).all()
+
+
+def test_sma_recovers_after_missing_bar():
+    assert_reference(_sma(CLOSE_GAP, 10), 9, {
+        14: 102.73598880214932,
+        15: np.nan,
+        24: np.nan,
+        25: 105.65384730920664,
+        39: 110.82154414043626,
+    })
+
+
+def test_atr_matches_pandas_ta():
+    assert_reference(_atr(HIGH, LOW, CLOSE, 14), 13, {
+        13: 3.702076238876988,
+        14: 3.620761670882299,
+        15: 3.622635988032427,
+        16: 3.6502374301274743,
+        39: 3.8926571521916293,
+    })
+    assert_reference(_atr(HIGH, LOW, CLOSE, 3), 2, {
+        2: 2.8798479058426616,
+        3: 2.7750840213384924,
+        4: 2.7517970335875876,
+        39: 3.8266576241802297,
+    })
+
+
+def test_atr_first_bar_is_high_low_range():
+    # No previous close on the first bar, so its true range is high - low
+    atr = _atr(HIGH, LOW, CLOSE, 1)
+    assert atr[0] == pytest.approx(2.5, rel=RTOL)
+    assert atr[0] == pytest.approx(HIGH[0] - LOW[0], rel=RTOL)
+
+
+def test_atr_seed_is_mean_true_range():
+    prev_close = np.concatenate(([np.nan], CLOSE[:-1]))
+    true_range = np.fmax(HIGH - LOW, np.fmax(np.abs(HIGH - prev_close), np.abs(prev_close - LOW)))
+    assert _atr(HIGH, LOW, CLOSE, 14)[13] == pytest.approx(true_range[:14].mean(), rel=RTOL)
+
+
+def test_atr_short_input():
+    assert np.isnan(_atr(HIGH[:10], LOW[:10], CLOSE[:10], 14)).all()
+    df = pd.DataFrame({"high": HIGH[:14], "low": LOW[:14], "close": CLOSE[:14]})
+    assert TechnicalIndicators.calculate_atr(df, period=14) is None
+
+
+def test_atr_carries_over_missing_bar():
+    high = HIGH.copy()
+    high[20] = np.nan
+    assert_reference(_atr(high, LOW, CLOSE_GAP, 14), 13, {
+        15: 3.622635988032427,
+        16: 3.5512178030654113,
+        20: 3.653154899891409,
+        21: 3.686175581991409,
+        39: 3.8281621430759434,
+    })
@@ -5,7 +5,7 @@ Tracks simulated balance, positions, and P&L without real money.
 Includes realistic fee accounting (0.025% taker fee) to match live trading.
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 import sys
@@ -40,6 +40,8 @@ class Position:
         self.position_id = position_id
         self.coin = coin
         self.side = side
+        # +1 for longs, -1 for shorts: profit is side_sign * price move
+        self.side_sign = 1.0 if side == 'long' else -1.0
         self.entry_price = entry_price
         self.quantity_usd = quantity_usd
         self.leverage = leverage
@@ -58,14 +60,8 @@ class Position:
         # Position size in base currency (e.g., BTC)
         position_size = (self.quantity_usd * self.leverage) / self.entry_price
 
-        if self.side == 'long':
-            # Long: profit when price goes up
-            pnl = (current_price - self.entry_price) * position_size
-        else:
-            # Short: profit when price goes down
-            pnl = (self.entry_price - current_price) * position_size
-
-        return pnl
+        # Long profits when price goes up, short when it goes down
+        return self.side_sign * (current_price - self.entry_price) * position_size
 
     def get_margin(self) -> float:
         """Get the margin (collateral) for this position."""
@@ -98,6 +94,9 @@ class TradingAccount:
         self.realized_pnl = 0.0
         self.positions: Dict[str, Position] = {}
 
+        # Values of the last snapshot written by save_state()
+        self._last_saved_state: Optional[tuple] = None
+
         # Try to load existing state from database
         self._load_from_database()
 
@@ -155,11 +154,24 @@ class TradingAccount:
         Returns:
             Total unrealized P&L in USD
         """
-        total_pnl = 0.0
-        for coin, position in self.positions.items():
-            if coin in current_prices:
-                total_pnl += position.calculate_pnl(current_prices[coin])
-        return total_pnl
+        return sum(self._position_pnls(current_prices).values())
+
+    def _position_pnls(self, current_prices: Dict[str, float]) -> Dict[str, float]:
+        """
+        Unrealized P&L of each open position, computed in one pass.
+
+        Positions without a current price count as flat (priced at entry).
+
+        Args:
+            current_prices: Dict of coin -> current price
+
+        Returns:
+            Dict of coin -> unrealized P&L in USD
+        """
+        return {
+            coin: position.calculate_pnl(current_prices.get(coin, position.entry_price))
+            for coin, position in self.positions.items()
+        }
 
     def can_open_position(self, quantity_usd: float, leverage: float = 1.0) -> bool:
         """
@@ -355,24 +367,58 @@ class TradingAccount:
                 
         return liquidations
 
-    def save_state(self, current_prices: Dict[str, float]):
+    def snapshot_state(self, current_prices: Dict[str, float]) -> Tuple[float, float, float, float, int]:
         """
-        Save current account state to database.
+        Capture the figures `save_state` writes, without touching the database.
+
+        Lets the caller read the positions on its own thread and hand the
+        snapshot to another thread for writing.
 
         Args:
             current_prices: Dict of coin -> current price for unrealized PnL calculation
+
+        Returns:
+            (balance, equity, unrealized_pnl, realized_pnl, num_positions)
         """
         unrealized_pnl = self.get_unrealized_pnl(current_prices)
-        equity = self.get_total_equity(current_prices)
+        equity = self.balance + unrealized_pnl
+        return (self.balance, equity, unrealized_pnl, self.realized_pnl, len(self.positions))
+
+    def save_state(
+        self,
+        current_prices: Optional[Dict[str, float]] = None,
+        snapshot: Optional[Tuple[float, float, float, float, int]] = None
+    ) -> bool:
+        """
+        Save current account state to database.
+
+        Skipped when nothing changed since the last saved snapshot (e.g. a
+        HOLD cycle with no open positions), so idle cycles don't add
+        identical rows or a commit.
 
+        Args:
+            current_prices: Dict of coin -> current price for unrealized PnL calculation
+            snapshot: State taken earlier with `snapshot_state`; used instead
+                of reading the positions again
+
+        Returns:
+            True if a snapshot was written
+        """
+        state = snapshot if snapshot is not None else self.snapshot_state(current_prices)
+        if state == self._last_saved_state:
+            return False
+
+        balance, equity, unrealized_pnl, realized_pnl, num_positions = state
         save_account_state(
-            balance_usd=self.balance,
+            balance_usd=balance,
             equity_usd=equity,
             unrealized_pnl=unrealized_pnl,
-            realized_pnl=self.realized_pnl,
+            realized_pnl=realized_pnl,
             sharpe_ratio=None,  # TODO: Calculate Sharpe ratio
-            num_positions=len(self.positions)
+            num_positions=num_positions
         )
+        self._last_saved_state = state
+        return True
 
     def get_summary(self, current_prices: Dict[str, float]) -> Dict:
         """
@@ -384,28 +430,34 @@ class TradingAccount:
         Returns:
             Dict with account metrics
         """
-        unrealized_pnl = self.get_unrealized_pnl(current_prices)
-        equity = self.get_total_equity(current_prices)
+        # Each position's PnL is computed once and reused for the totals
+        pnls = self._position_pnls(current_prices)
+        unrealized_pnl = sum(pnls.values())
+        equity = self.balance + unrealized_pnl
         total_pnl = self.realized_pnl + unrealized_pnl
 
-        # Get open positions from database (includes exit plan from linked decision)
-        db_positions = get_open_positions()
+        # Get open positions from database (includes exit plan from linked
+        # decision), indexed by coin; the first (most recent) entry wins
+        db_positions = {}
+        for p in get_open_positions():
+            db_positions.setdefault(p['coin'], p)
 
         # Build position list with enhanced data
         positions_list = []
         for pos in self.positions.values():
             # Find matching DB position to get exit plan
-            db_pos = next((p for p in db_positions if p['coin'] == pos.coin), None)
+            db_pos = db_positions.get(pos.coin)
 
             pos_data = {
                 'coin': pos.coin,
                 'side': pos.side,
                 'entry_price': pos.entry_price,
                 'entry_time': pos.entry_time.isoformat(),
+                'entry_ts': pos.entry_time.timestamp(),
                 'current_price': current_prices.get(pos.coin, pos.entry_price),
                 'quantity_usd': pos.quantity_usd,
                 'leverage': pos.leverage,
-                'unrealized_pnl': pos.calculate_pnl(current_prices.get(pos.coin, pos.entry_price))
+                'unrealized_pnl': pnls[pos.coin]
             }
 
             # Add exit plan if available from database
@@ -9,8 +9,10 @@ Additionally supports logging to Motherhaven dashboard via API when configured.
 """
 
 import sys
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional
 import json
 import logging
 
@@ -24,6 +26,7 @@ from web.database import (
     close_position,
     log_bot_status as db_log_bot_status,
     init_database,
+    batch_writes,
     get_open_positions as db_get_open_positions
 )
 from web.motherhaven_logger import MotherhavenLogger
@@ -67,6 +70,59 @@ class TradingLogger:
         else:
             logger.info("[Motherhaven] Integration disabled - only logging to SQLite")
 
+        # Motherhaven posts queued while a batch() block is open on this
+        # thread (the IO worker and the main thread batch independently)
+        self._batch_local = threading.local()
+
+    @contextmanager
+    def batch(self):
+        """
+        Log several records in one SQLite transaction.
+
+        Motherhaven posts made inside the block are sent after the commit so
+        the database write lock is not held across HTTP requests.
+
+        Example:
+            with logger.batch():
+                logger.log_account_state(...)
+                logger.log_bot_status('running')
+        """
+        if getattr(self._batch_local, 'deferred', None) is not None:
+            yield
+            return
+
+        self._batch_local.deferred = []
+        try:
+            with batch_writes():
+                yield
+            deferred = self._batch_local.deferred
+        finally:
+            self._batch_local.deferred = None
+
+        for post in deferred:
+            post()
+
+    def _send_to_motherhaven(self, what: str, method: str, *args, **kwargs):
+        """
+        Call a MotherhavenLogger method (if enabled), or queue the call while
+        a batch is open. Failures are logged, never raised.
+        """
+        if not self.motherhaven:
+            return
+        send = getattr(self.motherhaven, method)
+
+        def post():
+            try:
+                send(*args, **kwargs)
+            except Exception as e:
+                logger.warning(f"[Motherhaven] Failed to log {what}: {e}")
+
+        deferred: Optional[List[Callable[[], None]]] = getattr(self._batch_local, 'deferred', None)
+        if deferred is not None:
+            deferred.append(post)
+        else:
+            post()
+
     def log_decision(
         self,
         decision: Dict[str, Any],
@@ -97,11 +153,10 @@ class TradingLogger:
         decision_id = save_decision(decision, raw_response, system_prompt, user_prompt)
 
         # Send to Motherhaven API (if enabled)
-        if self.motherhaven:
-            try:
-                self.motherhaven.log_decision(decision, raw_response, system_prompt, user_prompt)
-            except Exception as e:
-                logger.warning(f"[Motherhaven] Failed to log decision: {e}")
+        self._send_to_motherhaven(
+            "decision", "log_decision",
+            decision, raw_response, system_prompt, user_prompt
+        )
 
         return decision_id
 
@@ -149,18 +204,15 @@ class TradingLogger:
         )
 
         # Send to Motherhaven API (if enabled)
-        if self.motherhaven:
-            try:
-                self.motherhaven.log_account_state(
-                    balance_usd=balance,
-                    equity_usd=equity,
-                    unrealized_pnl=unrealized_pnl,
-                    realized_pnl=realized_pnl,
-                    sharpe_ratio=sharpe_ratio,
-                    num_positions=num_positions
-                )
-            except Exception as e:
-                logger.warning(f"[Motherhaven] Failed to log account state: {e}")
+        self._send_to_motherhaven(
+            "account state", "log_account_state",
+            balance_usd=balance,
+            equity_usd=equity,
+            unrealized_pnl=unrealized_pnl,
+            realized_pnl=realized_pnl,
+            sharpe_ratio=sharpe_ratio,
+            num_positions=num_positions
+        )
 
         return state_id
 
@@ -208,18 +260,15 @@ class TradingLogger:
         )
 
         # Send to Motherhaven API (if enabled)
-        if self.motherhaven:
-            try:
-                self.motherhaven.log_position_entry(
-                    position_id=position_id,
-                    coin=coin,
-                    side=side,
-                    entry_price=entry_price,
-                    quantity_usd=quantity_usd,
-                    leverage=leverage
-                )
-            except Exception as e:
-                logger.warning(f"[Motherhaven] Failed to log position entry: {e}")
+        self._send_to_motherhaven(
+            "position entry", "log_position_entry",
+            position_id=position_id,
+            coin=coin,
+            side=side,
+            entry_price=entry_price,
+            quantity_usd=quantity_usd,
+            leverage=leverage
+        )
 
         return pos_id
 
@@ -268,20 +317,18 @@ class TradingLogger:
 
         # Send to Motherhaven API (if enabled and position was found)
         if self.motherhaven and success and position_data:
-            try:
-                self.motherhaven.log_position_exit(
-                    position_id=position_id,
-                    coin=position_data['coin'],
-                    side=position_data['side'],
-                    entry_price=position_data['entry_price'],
-                    entry_time=position_data['entry_time'],
-                    exit_price=exit_price,
-                    quantity_usd=position_data['quantity_usd'],
-                    leverage=position_data['leverage'],
-                    realized_pnl=realized_pnl
-                )
-            except Exception as e:
-                logger.warning(f"[Motherhaven] Failed to log position exit: {e}")
+            self._send_to_motherhaven(
+                "position exit", "log_position_exit",
+                position_id=position_id,
+                coin=position_data['coin'],
+                side=position_data['side'],
+                entry_price=position_data['entry_price'],
+                entry_time=position_data['entry_time'],
+                exit_price=exit_price,
+                quantity_usd=position_data['quantity_usd'],
+                leverage=position_data['leverage'],
+                realized_pnl=realized_pnl
+            )
 
         return success
 
@@ -307,15 +354,11 @@ class TradingLogger:
         db_log_bot_status(status=status, message=message, error=error)
 
         # Send to Motherhaven API (if enabled)
-        if self.motherhaven:
-            try:
-                status_message = message or error or ""
-                self.motherhaven.log_status(
-                    status=status,
-                    message=status_message
-                )
-            except Exception as e:
-                logger.warning(f"[Motherhaven] Failed to log bot status: {e}")
+        self._send_to_motherhaven(
+            "bot status", "log_status",
+            status=status,
+            message=message or error or ""
+        )
 
     def log_decision_from_trade_decision(
         self,
@@ -361,11 +404,10 @@ class TradingLogger:
         decision_id = save_decision(decision_dict, raw_response, system_prompt, user_prompt)
 
         # Send to Motherhaven API (if enabled) - uses self.log_decision logic
-        if self.motherhaven:
-            try:
-                self.motherhaven.log_decision(decision_dict, raw_response, system_prompt, user_prompt)
-            except Exception as e:
-                logger.warning(f"[Motherhaven] Failed to log decision: {e}")
+        self._send_to_motherhaven(
+            "decision", "log_decision",
+            decision_dict, raw_response, system_prompt, user_prompt
+        )
 
         return decision_id
 
@@ -29,6 +29,7 @@ from web.database import (
     get_account_history,
     get_open_positions,
     get_closed_positions,
+    get_closed_position_stats,
     get_all_positions,
     get_latest_bot_status,
     get_bot_status_history,
@@ -44,6 +45,7 @@ from web.database import (
     get_bot_config,
     update_bot_config
 )
+from web.bot_wake import notify_bot
 from config.settings import settings
 
 # Initialize Flask app
@@ -517,16 +519,17 @@ def api_stats():
     """
     account = get_latest_account_state()
     open_positions = get_open_positions()
-    closed_positions = get_closed_positions(limit=100)
+    # Aggregated over the last 100 closed positions in SQL
+    closed_stats = get_closed_position_stats(limit=100)
 
     # Calculate stats
-    total_trades = len(closed_positions)
-    winning_trades = len([p for p in closed_positions if p['realized_pnl'] and p['realized_pnl'] > 0])
-    losing_trades = len([p for p in closed_positions if p['realized_pnl'] and p['realized_pnl'] <= 0])
+    total_trades = closed_stats['total_trades']
+    winning_trades = closed_stats['winning_trades']
+    losing_trades = closed_stats['losing_trades']
 
     win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
 
-    total_realized_pnl = sum(p['realized_pnl'] for p in closed_positions if p['realized_pnl'])
+    total_realized_pnl = closed_stats['total_realized_pnl']
 
     return jsonify({
         'total_trades': total_trades,
@@ -615,9 +618,10 @@ def read_bot_state():
 
 
 def write_bot_state(state):
-    """Write bot state to control file."""
+    """Write bot state to control file and wake the bot to pick it up."""
     BOT_CONTROL_FILE.parent.mkdir(parents=True, exist_ok=True)
     BOT_CONTROL_FILE.write_text(state)
+    notify_bot()
 
 
 def is_bot_process_running():
@@ -0,0 +1,103 @@
+"""
+Wake the running bot when its control state changes.
+
+Control writers (the dashboard and the bot's start/stop/pause commands)
+write data/bot_control.txt and then call notify_bot(). The bot registers
+with listen_for_wake() and re-reads the file as soon as it is woken, so
+its periodic control file check is only a fallback for other writers.
+
+On POSIX the wakeup is SIGUSR1 to the PID in data/bot.pid. Windows has no
+SIGUSR1, so there the bot waits on a named kernel event instead.
+"""
+
+import hashlib
+import os
+import signal
+import threading
+from pathlib import Path
+from typing import Callable
+
+import psutil
+
+# PID of the running bot (written by run_analysis_bot.run_bot)
+PID_FILE = Path(__file__).parent.parent / "data" / "bot.pid"
+
+
+if hasattr(signal, 'SIGUSR1'):
+    def listen_for_wake(on_wake: Callable[[], None]) -> bool:
+        """
+        Call on_wake() whenever notify_bot() is called. Must be called from
+        the main thread.
+
+        Returns:
+            True if wakeups are delivered (otherwise only polling works)
+        """
+        signal.signal(signal.SIGUSR1, lambda sig, frame: on_wake())
+        return True
+
+    def notify_bot():
+        """Wake the running bot (if any) so it re-reads the control file now."""
+        try:
+            pid = int(PID_FILE.read_text())
+            # A stale pidfile may name an unrelated process, which SIGUSR1
+            # would terminate; only signal the bot itself
+            if any('run_analysis_bot' in arg for arg in psutil.Process(pid).cmdline()):
+                os.kill(pid, signal.SIGUSR1)
+        except (OSError, ValueError, psutil.Error):
+            pass
+
+else:
+    import ctypes
+    from ctypes import wintypes
+
+    _kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    _kernel32.CreateEventW.argtypes = (wintypes.LPVOID, wintypes.BOOL, wintypes.BOOL, wintypes.LPCWSTR)
+    _kernel32.CreateEventW.restype = wintypes.HANDLE
+    _kernel32.OpenEventW.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.LPCWSTR)
+    _kernel32.OpenEventW.restype = wintypes.HANDLE
+    _kernel32.SetEvent.argtypes = (wintypes.HANDLE,)
+    _kernel32.SetEvent.restype = wintypes.BOOL
+    _kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+    _kernel32.CloseHandle.restype = wintypes.BOOL
+    _kernel32.WaitForSingleObject.argtypes = (wintypes.HANDLE, wintypes.DWORD)
+    _kernel32.WaitForSingleObject.restype = wintypes.DWORD
+
+    _EVENT_MODIFY_STATE = 0x0002
+    _INFINITE = 0xFFFFFFFF
+    _WAIT_OBJECT_0 = 0
+
+    # One event per checkout (like the pidfile), so separate installs
+    # don't wake each other's bots
+    _EVENT_NAME = "Local\\llm-trading-bot-wake-" + hashlib.blake2b(
+        str(PID_FILE.resolve()).encode(), digest_size=8
+    ).hexdigest()
+
+    def listen_for_wake(on_wake: Callable[[], None]) -> bool:
+        """
+        Call on_wake() (from a daemon thread) whenever notify_bot() is called.
+
+        Returns:
+            True if wakeups are delivered (otherwise only polling works)
+        """
+        # Auto-reset: each wait consumes one notification
+        handle = _kernel32.CreateEventW(None, False, False, _EVENT_NAME)
+        if not handle:
+            return False
+
+        def wait():
+            while _kernel32.WaitForSingleObject(handle, _INFINITE) == _WAIT_OBJECT_0:
+                on_wake()
+
+        threading.Thread(target=wait, name="bot-wake", daemon=True).start()
+        return True
+
+    def notify_bot():
+        """Wake the running bot (if any) so it re-reads the control file now."""
+        # The event only exists while a bot holds it open
+        handle = _kernel32.OpenEventW(_EVENT_MODIFY_STATE, False, _EVENT_NAME)
+        if not handle:
+            return
+        try:
+            _kernel32.SetEvent(handle)
+        finally:
+            _kernel32.CloseHandle(handle)
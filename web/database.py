@@ -6,13 +6,16 @@ Tables:
 - account_state: Balance, PnL, Sharpe ratio snapshots
 - positions: Position history (entry/exit)
 - bot_status: Bot activity logs
+- decision_cache: Recent LLM responses for repeated prompt inputs
 """
 
 import sqlite3
 import json
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from contextlib import contextmanager
 
 # Database file location (default)
@@ -34,20 +37,157 @@ def set_database_path(mode: str = "paper"):
     else:
         DB_PATH = base_dir / "trading_bot_paper.db"
 
+    _invalidate_context()
+
+
+# Shared by the single-query getters and get_decision_and_position_context()
+_RECENT_DECISIONS_SQL = """
+    SELECT
+        d.*,
+        p.entry_price,
+        p.exit_price,
+        p.realized_pnl
+    FROM decisions d
+    LEFT JOIN positions p ON (
+        -- For entry signals, match on decision_id
+        (d.signal IN ('buy_to_enter', 'sell_to_enter') AND d.id = p.decision_id)
+        OR
+        -- For hold/close signals, find the most recent position for that coin
+        (d.signal IN ('hold', 'close') AND d.coin = p.coin
+         AND p.entry_time = (
+             SELECT MAX(p2.entry_time)
+             FROM positions p2
+             WHERE p2.coin = d.coin
+             AND p2.entry_time <= d.timestamp
+         ))
+    )
+    ORDER BY d.timestamp DESC
+    LIMIT ?
+"""
+
+_CLOSED_POSITIONS_SQL = """
+    SELECT * FROM positions
+    WHERE status = 'closed'
+    ORDER BY exit_time DESC
+    LIMIT ?
+"""
+
+
+# Connection of the `batch_writes()` block open on this thread, if any
+_batch_local = threading.local()
+
+# This thread's open connection, as (database path, connection)
+_conn_local = threading.local()
+
+# get_decision_and_position_context() results, keyed by (pos_limit,
+# dec_limit) -> (generation, fetched_at, result). This process's writes to
+# decisions/positions bump the generation once committed; the TTL bounds
+# staleness from writes made by other processes (dashboard, scripts).
+CONTEXT_CACHE_TTL_SECONDS = 300
+_context_cache: Dict[Tuple[int, int], Tuple[int, float, Any]] = {}
+_context_generation = 0
+
+
+def _invalidate_context():
+    """Drop cached get_decision_and_position_context() results."""
+    global _context_generation
+    _context_generation += 1
+    _context_cache.clear()
+
+
+def _context_changed():
+    """
+    Invalidate the cached prompt context after a decisions/positions write.
+
+    Inside a `batch_writes()` block this is deferred until the batch
+    commits, so a concurrent read can't re-cache the pre-commit rows.
+    """
+    if getattr(_batch_local, 'conn', None) is not None:
+        _batch_local.context_changed = True
+    else:
+        _invalidate_context()
+
+
+def _connect() -> sqlite3.Connection:
+    """
+    Get this thread's connection to the current database.
+
+    The connection is opened (and the pragmas applied) once per thread and
+    database path, then reused, so each call no longer pays for a connect.
+    """
+    cached = getattr(_conn_local, 'conn', None)
+    if cached is not None:
+        path, conn = cached
+        if path == DB_PATH:
+            return conn
+        conn.close()
 
-@contextmanager
-def get_db_connection():
-    """Context manager for database connections."""
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row  # Enable column access by name
+    # Safe with WAL (only the last commits can be lost on power failure)
+    # and avoids an fsync per commit
+    conn.execute("PRAGMA synchronous=NORMAL")
+    # Keep temp tables/sort spill in memory and read the file through a
+    # 256 MiB memory map instead of read() syscalls
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")
+    _conn_local.conn = (DB_PATH, conn)
+    return conn
+
+
+@contextmanager
+def get_db_connection():
+    """
+    Context manager for database connections.
+
+    Inside a `batch_writes()` block the batch's connection is reused and
+    nothing is committed until the batch exits.
+    """
+    batch_conn = getattr(_batch_local, 'conn', None)
+    if batch_conn is not None:
+        yield batch_conn
+        return
+
+    conn = _connect()
     try:
         yield conn
         conn.commit()
     except Exception as e:
         conn.rollback()
         raise e
+
+
+@contextmanager
+def batch_writes():
+    """
+    Run all database writes made in the block as a single transaction.
+
+    SQLite pays its sync cost per commit, so grouping the per-cycle inserts
+    commits (and syncs) once. Nested blocks join the outer transaction.
+
+    Example:
+        with batch_writes():
+            save_account_state(...)
+            log_bot_status('running')
+    """
+    if getattr(_batch_local, 'conn', None) is not None:
+        yield _batch_local.conn
+        return
+
+    conn = _connect()
+    conn.execute("BEGIN IMMEDIATE")
+    _batch_local.conn = conn
+    _batch_local.context_changed = False
+    try:
+        yield conn
+        conn.commit()
+        if _batch_local.context_changed:
+            _invalidate_context()
+    except Exception as e:
+        conn.rollback()
+        raise e
     finally:
-        conn.close()
+        _batch_local.conn = None
 
 
 def init_database():
@@ -59,6 +199,10 @@ def init_database():
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
     with get_db_connection() as conn:
+        # WAL lets the dashboard read while the bot writes; the mode is
+        # persistent, so setting it once per database is enough
+        conn.execute("PRAGMA journal_mode=WAL")
+
         cursor = conn.cursor()
 
         # Decisions table - stores all Claude trading decisions
@@ -182,6 +326,16 @@ def init_database():
             )
         """)
 
+        # Decision cache table - recent LLM responses keyed on a hash of the
+        # normalized prompt inputs (see get_cached_decision)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS decision_cache (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                ts INTEGER NOT NULL
+            )
+        """)
+
         # Initialize default settings if not exists
         cursor.execute("""
             INSERT OR IGNORE INTO bot_settings (key, value)
@@ -260,37 +414,17 @@ def save_decision(
             system_prompt,
             user_prompt
         ))
+        decision_id = cursor.lastrowid
 
-        return cursor.lastrowid
+    _context_changed()
+    return decision_id
 
 
 def get_recent_decisions(limit: int = 20) -> List[Dict[str, Any]]:
     """Get the most recent trading decisions with position data if available."""
     with get_db_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT
-                d.*,
-                p.entry_price,
-                p.exit_price,
-                p.realized_pnl
-            FROM decisions d
-            LEFT JOIN positions p ON (
-                -- For entry signals, match on decision_id
-                (d.signal IN ('buy_to_enter', 'sell_to_enter') AND d.id = p.decision_id)
-                OR
-                -- For hold/close signals, find the most recent position for that coin
-                (d.signal IN ('hold', 'close') AND d.coin = p.coin
-                 AND p.entry_time = (
-                     SELECT MAX(p2.entry_time)
-                     FROM positions p2
-                     WHERE p2.coin = d.coin
-                     AND p2.entry_time <= d.timestamp
-                 ))
-            )
-            ORDER BY d.timestamp DESC
-            LIMIT ?
-        """, (limit,))
+        cursor.execute(_RECENT_DECISIONS_SQL, (limit,))
 
         return [dict(row) for row in cursor.fetchall()]
 
@@ -337,8 +471,54 @@ def update_decision_execution(
                 execution_timestamp = ?
             WHERE id = ?
         """, (status, error, timestamp, decision_id))
+        updated = cursor.rowcount > 0
 
-        return cursor.rowcount > 0
+    _context_changed()
+    return updated
+
+
+# ============================================================================
+# DECISION CACHE
+# ============================================================================
+
+def get_cached_decision(key: str, max_age_seconds: int = 600) -> Optional[str]:
+    """
+    Get a cached LLM response for identical prompt inputs.
+
+    Args:
+        key: Hash of the normalized prompt inputs
+        max_age_seconds: Ignore entries older than this
+
+    Returns:
+        Raw response text, or None if there is no fresh entry
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT response FROM decision_cache
+            WHERE key = ? AND ts >= ?
+        """, (key, int(time.time()) - max_age_seconds))
+        row = cursor.fetchone()
+        return row['response'] if row else None
+
+
+def save_cached_decision(key: str, response: str, max_age_seconds: int = 600):
+    """
+    Cache an LLM response and drop entries older than max_age_seconds.
+
+    Args:
+        key: Hash of the normalized prompt inputs
+        response: Raw response text
+        max_age_seconds: Age after which entries are purged
+    """
+    now = int(time.time())
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT OR REPLACE INTO decision_cache (key, response, ts)
+            VALUES (?, ?, ?)
+        """, (key, response, now))
+        cursor.execute("DELETE FROM decision_cache WHERE ts < ?", (now - max_age_seconds,))
 
 
 # ============================================================================
@@ -425,8 +605,10 @@ def save_position_entry(
                 quantity_usd, leverage, decision_id, status
             ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'open')
         """, (position_id, coin, side, entry_time, entry_price, quantity_usd, leverage, decision_id))
+        row_id = cursor.lastrowid
 
-        return cursor.lastrowid
+    _context_changed()
+    return row_id
 
 
 def close_position(position_id: str, exit_price: float, realized_pnl: float) -> bool:
@@ -441,8 +623,10 @@ def close_position(position_id: str, exit_price: float, realized_pnl: float) ->
             SET exit_time = ?, exit_price = ?, realized_pnl = ?, status = 'closed'
             WHERE position_id = ?
         """, (exit_time, exit_price, realized_pnl, position_id))
+        updated = cursor.rowcount > 0
 
-        return cursor.rowcount > 0
+    _context_changed()
+    return updated
 
 
 def get_open_positions() -> List[Dict[str, Any]]:
@@ -467,16 +651,86 @@ def get_open_positions() -> List[Dict[str, Any]]:
 
 def get_closed_positions(limit: int = 50) -> List[Dict[str, Any]]:
     """Get recently closed positions."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(_CLOSED_POSITIONS_SQL, (limit,))
+
+        return [dict(row) for row in cursor.fetchall()]
+
+
+def get_closed_position_stats(limit: int = 100) -> Dict[str, Any]:
+    """
+    Win/loss counts and realized PnL over the most recently closed positions.
+
+    Aggregated in SQLite, so the rows are never materialized in Python.
+
+    Returns:
+        Dict with total_trades, winning_trades, losing_trades and
+        total_realized_pnl
+    """
     with get_db_connection() as conn:
         cursor = conn.cursor()
         cursor.execute("""
-            SELECT * FROM positions
-            WHERE status = 'closed'
-            ORDER BY exit_time DESC
-            LIMIT ?
+            SELECT
+                COUNT(*),
+                COALESCE(SUM(realized_pnl > 0), 0),
+                COALESCE(SUM(realized_pnl < 0), 0),
+                COALESCE(SUM(realized_pnl), 0.0)
+            FROM (
+                SELECT realized_pnl FROM positions
+                WHERE status = 'closed'
+                ORDER BY exit_time DESC
+                LIMIT ?
+            )
         """, (limit,))
+        total, winning, losing, realized = cursor.fetchone()
 
-        return [dict(row) for row in cursor.fetchall()]
+        return {
+            'total_trades': total,
+            'winning_trades': winning,
+            'losing_trades': losing,
+            'total_realized_pnl': realized,
+        }
+
+
+def get_decision_and_position_context(
+    pos_limit: int = 10,
+    dec_limit: int = 5
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Get recently closed positions and recent decisions in one read.
+
+    Both queries run on a single connection inside one transaction, so the
+    prompt context comes from a consistent snapshot. The result is cached
+    until this process next writes a decision or position (or for
+    CONTEXT_CACHE_TTL_SECONDS), so most cycles don't touch the database;
+    treat the returned rows as read-only.
+
+    Returns:
+        (closed_positions, recent_decisions)
+    """
+    key = (pos_limit, dec_limit)
+    generation = _context_generation
+    cached = _context_cache.get(key)
+    if (cached is not None and cached[0] == generation
+            and time.monotonic() - cached[1] < CONTEXT_CACHE_TTL_SECONDS):
+        return cached[2]
+
+    fetched_at = time.monotonic()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        if not conn.in_transaction:
+            cursor.execute("BEGIN")
+        cursor.execute(_CLOSED_POSITIONS_SQL, (pos_limit,))
+        closed = [dict(row) for row in cursor.fetchall()]
+        cursor.execute(_RECENT_DECISIONS_SQL, (dec_limit,))
+        decisions = [dict(row) for row in cursor.fetchall()]
+
+    result = (closed, decisions)
+    # Skip caching if a write committed while we were reading
+    if generation == _context_generation:
+        _context_cache[key] = (generation, fetched_at, result)
+    return result
 
 
 def get_all_positions(limit: int = 100) -> List[Dict[str, Any]]:
@@ -839,6 +1093,7 @@ def reset_database(preserve_schema: bool = True) -> bool:
                 cursor.execute("DELETE FROM positions")
                 cursor.execute("DELETE FROM bot_status")
                 cursor.execute("DELETE FROM user_inputs")
+                cursor.execute("DELETE FROM decision_cache")
                 
                 # Reset autoincrement counters
                 cursor.execute("DELETE FROM sqlite_sequence WHERE name='decisions'")
@@ -860,10 +1115,13 @@ def reset_database(preserve_schema: bool = True) -> bool:
                 cursor.execute("DROP TABLE IF EXISTS positions")
                 cursor.execute("DROP TABLE IF EXISTS bot_status")
                 cursor.execute("DROP TABLE IF EXISTS user_inputs")
+                cursor.execute("DROP TABLE IF EXISTS decision_cache")
                 cursor.execute("DROP TABLE IF EXISTS sqlite_sequence")
                 
                 print(f"[OK] Database tables dropped: {DB_PATH}")
-                
+
+        _invalidate_context()
+
         # Reinitialize schema if we dropped tables
         if not preserve_schema:
             init_database()
@@ -8,8 +8,21 @@ via the modern Motherhaven dashboard. SQLite remains as local backup.
 import requests
 from typing import Optional, Dict, Any
 from datetime import datetime
+import json
 import logging
 
+try:
+    # orjson is optional; it encodes the (prompt-sized) decision payloads
+    # several times faster than the json module
+    import orjson
+
+    def _dumps(data: Dict[str, Any]) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+except ImportError:
+    def _dumps(data: Dict[str, Any]) -> bytes:
+        # Same encoding requests uses for `json=`
+        return json.dumps(data, allow_nan=False).encode("utf-8")
+
 logger = logging.getLogger(__name__)
 
 
@@ -39,6 +52,10 @@ class MotherhavenLogger:
         self.enabled = enabled
         self.timeout = timeout
 
+        # One session for all posts, so the bot's per-cycle posts reuse a
+        # keep-alive connection instead of a new TCP/TLS handshake each
+        self.session = requests.Session()
+
         if not self.enabled:
             logger.info("[Motherhaven] Logger disabled - no data will be sent to API")
         else:
@@ -65,9 +82,9 @@ class MotherhavenLogger:
         }
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 url,
-                json=data,
+                data=_dumps(data),
                 headers=headers,
                 timeout=self.timeout
             )